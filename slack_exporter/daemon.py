@@ -0,0 +1,324 @@
+import argparse
+import json
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from slack_exporter.etl import ETL
+from slack_exporter.load.google_drive_uploader import GoogleDriveUploader
+from slack_exporter.load.mega_uploader import MegaUploader
+from slack_exporter.load.s3_uploader import S3Uploader
+from slack_exporter.load.uploader import Uploader
+from slack_exporter.logger_config import logger
+from slack_exporter.manifest import MANIFEST_PREFIX, Manifest
+
+
+STATE_FILE_NAME = f"{MANIFEST_PREFIX}daemon.json"
+
+UPLOADERS: dict[str, type[Uploader] | None] = {
+    "local": None,
+    "mega": MegaUploader,
+    "google_drive": GoogleDriveUploader,
+    "s3": S3Uploader,
+}
+
+
+class SlackDaemon:
+    """Long-running backup service that polls channels for new messages and feeds them through transform and load.
+
+    The Slack session, the channel list and the polling state are kept between polls. Each channel is polled on its own
+    interval: the interval is halved when a poll returns new messages and doubled when it returns none, within
+    `min_interval` and `max_interval`, so busy channels are checked often and dormant ones rarely.
+    New messages and their attachments are accumulated in a batch folder of local_dir, which is compressed, indexed and
+    uploaded every `batch_interval` seconds. The last backed up message of each channel is saved in a state file
+    once its batch has been stored, so that a restarted daemon resumes where it stopped.
+
+    Like incremental runs, polling only fetches new messages: edits and deletions of messages already backed up,
+    and replies posted in older threads, are only captured by a regular export.
+
+    Attributes:
+        etl (ETL): The ETL whose settings, exporter, transform, index and load steps are used for each batch.
+        uploader (Uploader): Optional uploader of the batches. Batches are kept in local_dir without one.
+        state_path (Path): The path to the daemon state file. Defaults to a file in local_dir.
+        min_interval (float): The shortest polling interval of a channel, in seconds.
+        max_interval (float): The longest polling interval of a channel, in seconds.
+        batch_interval (float): The time new messages are accumulated before a batch is stored, in seconds.
+        rediscover_interval (float): The time between two refreshes of the channel list, in seconds.
+        channels (dict[str, dict]): The polling state of each channel by ID, with its name, the `ts` of its last
+            backed up message, its polling interval, its next poll time and whether it is still in the channel list.
+    """
+
+    def __init__(
+            self,
+            etl: ETL,
+            uploader: Uploader = None,
+            state_path: str | Path = None,
+            min_interval: float = 60,
+            max_interval: float = 3600,
+            batch_interval: float = 300,
+            rediscover_interval: float = 3600
+        ):
+        self.etl = etl
+        self.uploader = uploader
+        self.base_dir = Path(etl.local_dir)
+        self.state_path = Path(state_path or self.base_dir / STATE_FILE_NAME)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.batch_interval = batch_interval
+        self.rediscover_interval = rediscover_interval
+
+        self.exporter = etl._slack_exporter()
+        self.channels = {}
+        self.next_rediscovery = 0
+        self.batch = None
+        self._stopped = threading.Event()
+
+        if self.state_path.exists():
+            with open(self.state_path, 'r') as f:
+                self.channels = json.load(f).get("channels", {})
+
+    def save_state(self) -> None:
+        """Writes the committed polling state. Next poll times are not kept, channels are polled again on restart."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            channel_id: {key: channel[key] for key in ("name", "last_ts", "interval")}
+            for channel_id, channel in self.channels.items()
+        }
+        with open(self.state_path, 'w') as f:
+            json.dump({"version": 1, "channels": state}, f, indent=4)
+
+    def discover_channels(self) -> None:
+        """Refreshes the channel list. New channels are backed up from the ETL's oldest timestamp.
+
+        Channels missing from the refreshed list, e.g. deleted, archived or no longer joined, are marked inactive and
+        not polled anymore. Their state is kept so that they resume from their last backed up message if they reappear.
+        """
+        logger.info("Refreshing channel list...")
+
+        channels = self.exporter._select_channels(self.etl.shard)
+        for state in self.channels.values():
+            state["active"] = False
+        for channel in channels:
+            state = self.channels.setdefault(channel["id"], {
+                "last_ts": self.etl.oldest_timestamp or 0,
+                "interval": self.min_interval
+            })
+            state["name"] = channel["name"]
+            state["active"] = True
+
+        self.next_rediscovery = time.time() + self.rediscover_interval
+        logger.info(f"Watching {len(channels)} channels.")
+
+    def poll_channel(self, channel_id: str) -> int:
+        """Fetches the messages posted in a channel since its last poll, adds them to the batch and adapts its interval.
+
+        If the history cannot be fetched entirely, nothing is added and the same range is fetched again on the next poll,
+        since a partial history may miss older messages than the ones it holds.
+
+        Returns:
+            int: The number of new messages.
+        """
+        state = self.channels[channel_id]
+        try:
+            messages = self.exporter.fetch_channel_history(
+                channel_id=channel_id,
+                oldest_timestamp=state.get("pending_ts", state["last_ts"]),
+                windows=self.etl.history_windows
+            )
+        except Exception as e:
+            logger.error(f"Failed to poll channel {state['name']}, retrying in {self.min_interval:.0f}s: {e}")
+            state["next_poll"] = time.time() + self.min_interval
+            return 0
+
+        if messages:
+            self._add_to_batch(channel_id, state["name"], messages)
+            state["pending_ts"] = max((message["ts"] for message in messages), key=float)
+            state["interval"] = max(state["interval"] / 2, self.min_interval)
+        else:
+            state["interval"] = min(state["interval"] * 2, self.max_interval)
+
+        state["next_poll"] = time.time() + state["interval"]
+        return len(messages)
+
+    def _add_to_batch(self, channel_id: str, channel_name: str, messages: list[dict]) -> None:
+        if not self.batch:
+            batch_id = f"batch-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+            path = self.base_dir / batch_id
+            path.mkdir(parents=True, exist_ok=True)
+            self.batch = {"path": path, "manifest": Manifest(shard=self.etl.shard), "started": time.time(), "messages": {}}
+            logger.info(f"Starting batch {batch_id}...")
+
+        # Layouts may overwrite the file of a channel, so the batch is rewritten with all the messages it holds
+        batch_messages = self.batch["messages"].setdefault(channel_id, {})
+        batch_messages.update((message["ts"], message) for message in messages)
+
+        written = self.exporter.layout.write_channel(
+            export_path=self.batch["path"],
+            channel_name=channel_name,
+            messages=sorted(batch_messages.values(), key=lambda message: float(message["ts"]), reverse=True),
+            manifest=self.batch["manifest"]
+        )
+        self.batch["manifest"].add_channel(
+            channel_id=channel_id,
+            name=channel_name,
+            messages=len(batch_messages),
+            path=written[0].relative_to(self.batch["path"]).parts[0]
+        )
+
+    def flush(self) -> None:
+        """Downloads the attachments of the current batch, then compresses, indexes and stores it.
+
+        The polling state is only committed once the batch is stored: a batch that fails is retried on the next flush,
+        and fetched again if the daemon restarts.
+        """
+        if not self.batch:
+            return
+
+        path, manifest = self.batch["path"], self.batch["manifest"]
+        logger.info(f"Storing batch {path.name}...")
+
+        if self.exporter.attachment_source == "files_list":
+            self._download_listed_files(path, manifest)
+        else:
+            self.exporter.download_attachments(path, self.etl.file_suffix, manifest=manifest)
+        manifest.save(path)
+
+        self.etl.local_dir = path
+        self.etl._transform()
+        self.etl._index()
+        if self.uploader:
+            self.etl._load(uploader=self.uploader)
+
+        for state in self.channels.values():
+            if "pending_ts" in state:
+                state["last_ts"] = state.pop("pending_ts")
+        self.save_state()
+
+        self.batch = None
+        logger.info(f"Batch {path.name} stored.")
+
+    def _download_listed_files(self, path: Path, manifest: Manifest) -> None:
+        """Downloads the files of the batch found with files.list, with the exporter's type, size and order settings.
+
+        Files are listed once for the whole batch, and only the files created in a channel during the range polled
+        for this batch are downloaded into that channel.
+        """
+        ranges = {
+            channel_id: (float(self.channels[channel_id]["last_ts"]), float(self.channels[channel_id]["pending_ts"]))
+            for channel_id in self.batch["messages"]
+        }
+        listed_files = self.exporter.list_files(
+            ts_from=min(oldest for oldest, _ in ranges.values()),
+            ts_to=max(latest for _, latest in ranges.values()) + 1,
+            types=self.exporter.file_types
+        )
+        files = [
+            file_info for file_info in listed_files
+            if any(
+                ranges[channel_id][0] < file_info.get("created", 0) <= ranges[channel_id][1]
+                for channel_id in self.exporter._file_channels(file_info) if channel_id in ranges
+            )
+        ]
+
+        self.exporter.download_listed_files(
+            path,
+            channels={channel_id: self.channels[channel_id]["name"] for channel_id in ranges},
+            file_suffix=self.etl.file_suffix,
+            manifest=manifest,
+            files=files
+        )
+
+    def run_once(self) -> float:
+        """Polls the channels that are due and stores the batch when it is old enough.
+
+        Returns:
+            float: The time until the next channel is due or the batch must be stored, in seconds.
+        """
+        now = time.time()
+        if now >= self.next_rediscovery:
+            self.discover_channels()
+
+        for channel_id, state in self.channels.items():
+            if self._stopped.is_set():
+                break
+            if state.get("active") and state.get("next_poll", 0) <= time.time():
+                count = self.poll_channel(channel_id)
+                if count:
+                    logger.info(f"{count} new messages in {state['name']}, next poll in {state['interval']:.0f}s.")
+
+        if self.batch and time.time() - self.batch["started"] >= self.batch_interval:
+            self.flush()
+
+        deadlines = [state.get("next_poll", 0) for state in self.channels.values() if state.get("active")]
+        deadlines.append(self.next_rediscovery)
+        if self.batch:
+            deadlines.append(self.batch["started"] + self.batch_interval)
+
+        return max(min(deadlines) - time.time(), 0)
+
+    def run(self) -> None:
+        """Polls and stores new messages until stopped by SIGINT or SIGTERM, then stores the pending batch.
+
+        Raises:
+            Exception: if Slack authentication fails
+        """
+        self.exporter.authenticate()
+        if self.uploader is None:
+            logger.info(f"No uploader configured, batches are kept in {self.base_dir}")
+
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, lambda *_: self.stop())
+
+        logger.info("=== Slack backup daemon started ===")
+        while not self._stopped.is_set():
+            try:
+                delay = self.run_once()
+            except Exception as e:
+                logger.error(f"Error during polling: {e}")
+                delay = self.min_interval
+
+            self._stopped.wait(delay)
+
+        self.flush()
+        logger.info("=== Slack backup daemon stopped ===")
+
+    def stop(self) -> None:
+        logger.info("Stopping daemon...")
+        self._stopped.set()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv, find_dotenv
+
+    from slack_exporter.orchestrator import build_etl, load_config, resolve_env
+
+    load_dotenv(dotenv_path=find_dotenv())
+
+    parser = argparse.ArgumentParser(description="Continuously back up a Slack workspace as new messages are posted.")
+    parser.add_argument("config", type=Path, help="Path to the JSON workspaces configuration.")
+    parser.add_argument("--workspace", default=None, help="The workspace to watch. Defaults to the first one.")
+    parser.add_argument("--min-interval", type=float, default=60, help="Shortest polling interval of a channel, in seconds.")
+    parser.add_argument("--max-interval", type=float, default=3600, help="Longest polling interval of a channel, in seconds.")
+    parser.add_argument("--batch-interval", type=float, default=300, help="Time between two stored batches, in seconds.")
+    args = parser.parse_args()
+
+    workspaces = load_config(args.config).get("workspaces", [])
+    workspace = next(
+        (workspace for workspace in workspaces if args.workspace in (None, workspace["name"])),
+        None
+    )
+    if not workspace:
+        raise SystemExit(f"Workspace {args.workspace} not found in {args.config}")
+
+    uploader_class = UPLOADERS[workspace.get("destination", "local")]
+    SlackDaemon(
+        etl=build_etl(workspace),
+        uploader=uploader_class(credentials=resolve_env(workspace.get("credentials"))) if uploader_class else None,
+        state_path=workspace.get("state_path"),
+        min_interval=args.min_interval,
+        max_interval=args.max_interval,
+        batch_interval=args.batch_interval
+    ).run()
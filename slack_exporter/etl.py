@@ -3,14 +3,21 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
 
+from slack_exporter.extract.export_plan import ExportPlan
 from slack_exporter.extract.exporter import Exporter
+from slack_exporter.extract.rate_limiter import RateLimiter
 from slack_exporter.extract.slack_exporter import SlackExporter
+from slack_exporter.index.message_index import MessageIndex
+from slack_exporter.index.search_index import SearchIndex
 from slack_exporter.load.google_drive_uploader import GoogleDriveUploader
 from slack_exporter.load.mega_uploader import MegaUploader
+from slack_exporter.load.s3_uploader import S3Uploader
 from slack_exporter.load.uploader import Uploader
 from slack_exporter.logger_config import logger
+from slack_exporter.manifest import Manifest, is_metadata_file
+from slack_exporter.snapshot import CHAIN_FILE_NAME, SnapshotChain
 from slack_exporter.transform.compress import FileCompressor
-from slack_exporter.transform.organize import FileOrganizer
+from slack_exporter.transform.layout import Layout, get_layout
 from slack_exporter.transform.tools import get_files_in_folder
 
 
@@ -25,6 +32,23 @@ class ETL(ABC):
         credentials (dict[str, str]): Credentials for accessing remote storage.
         file_suffix (str): Optional suffix for files to be processed.
         oldest_timestamp (datetime.timestamp): Optional timestamp to filter data.
+        index_path (str): Optional path to a SQLite message index updated after each export.
+        full_text_search (bool): Whether the message index should also support full-text search.
+        slack_token (str): Optional Slack bot token. Defaults to the SLACK_BOT_TOKEN environment variable.
+        transfer_slots (Semaphore): Optional semaphore shared between ETL processes to cap concurrent downloads and uploads.
+        shard (tuple[int, int]): Optional 1-based shard index and number of shards, to only export a subset of the channels.
+        layout (str | Layout): Optional output layout, `by_extension` (default) or `slack` for one file per channel and per day.
+        history_windows (int): Number of time windows fetched concurrently for channels with more than one page of history.
+            Windows share the token's rate limit, so they only help when `call_interval` is shorter than the API latency.
+        call_interval (float): The minimum number of seconds between two Slack API calls made with the token.
+        chain_path (str): Optional path to a snapshot chain manifest. If provided, each run exports a full snapshot or an
+            incremental delta into its own subfolder of local_dir, see `SnapshotChain`.
+        full_every_days (float): The maximum age of a full snapshot before a new one is taken, in snapshot mode.
+        normalized (bool): Whether message files are written in the compact normalized format instead of indented JSON.
+        attachment_source (str): How attachments are found, `messages` (default) or `files_list`, see `SlackExporter`.
+        file_types (str): Comma-separated files.list types to download in `files_list` mode, e.g. `images,pdfs`.
+        max_file_size (int): Files larger than this, in bytes, are skipped in `files_list` mode.
+        file_order (str): The order downloads are scheduled in `files_list` mode, `largest_first` or `smallest_first`.
     """
     
     def __init__(
@@ -33,13 +57,99 @@ class ETL(ABC):
             remote_dir: str = None, 
             credentials: dict[str, str] = None,
             file_suffix: str = None,
-            oldest_timestamp: datetime.timestamp = None
+            oldest_timestamp: datetime.timestamp = None,
+            index_path: str = None,
+            full_text_search: bool = False,
+            slack_token: str = None,
+            transfer_slots=None,
+            shard: tuple[int, int] = None,
+            layout: str | Layout = None,
+            history_windows: int = 1,
+            call_interval: float = 1.0,
+            chain_path: str = None,
+            full_every_days: float = 7,
+            normalized: bool = False,
+            attachment_source: str = "messages",
+            file_types: str = None,
+            max_file_size: int = None,
+            file_order: str = None
         ):
         self.local_dir = Path(local_dir)
         self.remote_dir = remote_dir
         self.credentials = credentials
         self.file_suffix = file_suffix
         self.oldest_timestamp = oldest_timestamp
+        self.index_path = index_path
+        self.full_text_search = full_text_search
+        self.slack_token = slack_token
+        self.transfer_slots = transfer_slots
+        self.shard = shard
+        self.layout = layout
+        self.history_windows = history_windows
+        self.call_interval = call_interval
+        self.chain_path = chain_path
+        self.full_every_days = full_every_days
+        self.normalized = normalized
+        self.attachment_source = attachment_source
+        self.file_types = file_types
+        self.max_file_size = max_file_size
+        self.file_order = file_order
+        self.snapshot = None
+
+    def _begin_snapshot(self) -> None:
+        """In snapshot mode, decides whether this run exports a full snapshot or a delta, and where.
+
+        The chain manifest, including the pending snapshot, is copied into the snapshot folder so that it is uploaded with it.
+        """
+
+        if not self.chain_path:
+            return
+
+        chain = SnapshotChain(self.chain_path, full_every_days=self.full_every_days)
+        self.snapshot = chain.next_snapshot(
+            oldest_timestamp=self.oldest_timestamp,
+            layout=get_layout(self.layout).name
+        )
+        logger.info(f"Starting {self.snapshot['kind']} snapshot {self.snapshot['id']}...")
+
+        self.local_dir = self.local_dir / self.snapshot["id"]
+        self.local_dir.mkdir(parents=True, exist_ok=True)
+        self.oldest_timestamp = self.snapshot["oldest"]
+
+        chain.record(self.snapshot)
+        chain.save(self.local_dir / CHAIN_FILE_NAME)
+
+    def _commit_snapshot(self) -> None:
+        """In snapshot mode, records the snapshot in the chain manifest once it has been stored successfully.
+
+        It must only be called at the end of a run, after `_extract` and `_load`, which raise when the export
+        fails or the upload does not match its manifest.
+        """
+
+        if not self.snapshot:
+            return
+
+        chain = SnapshotChain(self.chain_path, full_every_days=self.full_every_days)
+        chain.record(self.snapshot)
+        chain.save()
+
+        logger.info(f"Snapshot {self.snapshot['id']} recorded in {self.chain_path}")
+
+    def _slack_exporter(self) -> SlackExporter:
+        """Creates a Slack exporter authenticated with this ETL's token.
+        In snapshot mode, the exporter fails instead of skipping channels whose history cannot be fetched entirely."""
+        return SlackExporter(
+            token=self.slack_token,
+            rate_limiter=RateLimiter(min_interval=self.call_interval),
+            transfer_slots=self.transfer_slots,
+            layout=get_layout(self.layout, normalized=self.normalized),
+            history_windows=self.history_windows,
+            attachment_source=self.attachment_source,
+            file_types=self.file_types,
+            max_file_size=self.max_file_size,
+            file_order=self.file_order,
+            strict=self.snapshot is not None
+        )
 
     def _extract(self, exporter: Exporter) -> Path:
         """Extracts data from a source using the provided exporter.
@@ -47,30 +157,102 @@ class ETL(ABC):
         Args:
             exporter: An instance of an exporter class to handle data extraction.
 
+        Raises:
+            Exception: In snapshot mode, if the export failed, so that the run stops before the snapshot is recorded.
+
         Returns:
             Path: The path to the exported data or None if an error occurred.
         """
         
         try:
-            return exporter.export(
+            export_path = exporter.export(
                 export_path=self.local_dir,
                 oldest_timestamp=self.oldest_timestamp,
-                file_suffix=self.file_suffix
+                file_suffix=self.file_suffix,
+                shard=self.shard
             )
 
         except Exception as e:
             logger.error(f"Error creating export: {e}")
+            export_path = None
+
+        if export_path is None and self.snapshot:
+            raise Exception(f"Export of snapshot {self.snapshot['id']} failed, it is not recorded in the chain")
+
+        return export_path
+
+    def _plan(self, exporter: Exporter) -> ExportPlan:
+        """Estimates the cost of an extraction without fetching any content.
+
+        Args:
+            exporter: An instance of an exporter class.
+
+        Returns:
+            ExportPlan | None: The projected number of API calls, wall time and bytes to transfer,
+                or None if the exporter does not support planning.
+        """
+
+        logger.info("Planning export...")
+
+        plan = exporter.plan(oldest_timestamp=self.oldest_timestamp, shard=self.shard)
+        if plan is None:
+            logger.warning(f"{type(exporter).__name__} does not support planning, nothing was estimated")
             return None
 
+        logger.info(str(plan))
+
+        return plan
+
     def _transform(self):
-        """Transforms the extracted data by compressing files and organizing them into folders."""
+        """Transforms the extracted data by compressing large files.
+        The export manifest, if any, is updated with the new paths and checksums."""
 
         logger.info("Transforming extracted data...")
-    
+
+        manifest = Manifest.find(self.local_dir)
+        compressor = FileCompressor(max_size=100*1000000)
+
         for file in get_files_in_folder(folder_path=self.local_dir):
-            FileCompressor(max_size=100*1000000).compress_file(file_path=file, replace=True)
+            if is_metadata_file(file):
+                continue
+
+            compressed_file = compressor.compress_file(file_path=file, replace=True)
+            if compressed_file and manifest:
+                manifest.move_file(
+                    old_path=self._relative(file),
+                    new_path=self._relative(compressed_file),
+                    checksum=compressor.checksums[compressed_file]
+                )
+
+        if manifest:
+            manifest.save(self.local_dir)
 
-        FileOrganizer(self.local_dir).organize_files()
+    def _relative(self, path: Path) -> str:
+        """Returns the path of an exported file relative to the local directory, as recorded in manifests."""
+        return path.relative_to(self.local_dir).as_posix()
+
+    def _index(self) -> None:
+        """Updates the local message index with the transformed data, if an index path is configured."""
+
+        if not self.index_path:
+            return
+
+        try:
+            index_class = SearchIndex if self.full_text_search else MessageIndex
+            with index_class(self.index_path) as index:
+                index.update(
+                    backup_dir=self.local_dir,
+                    file_suffix=self.file_suffix,
+                    layout=self.layout,
+                    backup=self._backup_location()
+                )
+
+        except Exception as e:
+            logger.error(f"Error updating message index: {e}")
+
+    def _backup_location(self) -> str:
+        """Returns the location of the backup once stored, recorded in the message index: its folder in remote_dir."""
+        return "/".join(part for part in (self.remote_dir, self.local_dir.name) if part)
 
     def _load(self, uploader: Uploader, cleanup: bool = True) -> bool:
         """Loads the transformed data into the desired storage location using the provided uploader.
@@ -84,12 +266,23 @@ class ETL(ABC):
         
         logger.info(f"Loading transformed data...")
 
-        if uploader.upload_folder(
-            local_folder_path=self.local_dir, 
-            remote_folder_id=self.remote_dir
-            ):
+        if self.transfer_slots:
+            self.transfer_slots.acquire()
+        try:
+            uploaded = uploader.upload_folder(
+                local_folder_path=self.local_dir,
+                remote_folder_id=self.remote_dir
+            )
+        finally:
+            if self.transfer_slots:
+                self.transfer_slots.release()
+
+        if uploaded:
             logger.info("Backup uploaded to cloud storage")
 
+            if not self._verify(uploader):
+                raise Exception("Uploaded backup does not match its manifest")
+
             if cleanup:
                 logger.info("Cleaning up local directory...")
                 shutil.rmtree(self.local_dir)
@@ -98,6 +291,29 @@ class ETL(ABC):
         
         return True
     
+    def _verify(self, uploader: Uploader) -> bool:
+        """Checks the uploaded data against the export manifest, when the storage supports it.
+
+        Args:
+            uploader: The Uploader instance used to upload the data.
+
+        Returns:
+            bool: False if files are missing or mismatching, True otherwise, including when verification is not supported.
+        """
+
+        problems = uploader.verify(local_folder_path=self.local_dir, remote_folder_id=self.remote_dir)
+        if problems is None:
+            logger.warning(f"{type(uploader).__name__} does not support verification, uploaded backup not verified")
+            return True
+
+        for problem in problems:
+            logger.error(problem)
+
+        if not problems:
+            logger.info("Uploaded backup matches its manifest")
+
+        return not problems
+
     @abstractmethod
     def run(self):
         """This method should be implemented by subclasses to define the specific ETL workflow. For instance, it may call the extract, transform, and load methods in sequence.
@@ -110,25 +326,60 @@ class ETL(ABC):
 
 class SlackToMega(ETL):
 
+    def plan(self) -> ExportPlan:
+        return self._plan(exporter=self._slack_exporter())
+
     def run(self):
-        self._extract(exporter=SlackExporter())
+        self._begin_snapshot()
+        self._extract(exporter=self._slack_exporter())
         self._transform()
+        self._index()
         self._load(uploader=MegaUploader(credentials=self.credentials))
+        self._commit_snapshot()
 
 
 class SlackToGoogleDrive(ETL):
     
+    def plan(self) -> ExportPlan:
+        return self._plan(exporter=self._slack_exporter())
+
     def run(self):
-        self._extract(exporter=SlackExporter())
+        self._begin_snapshot()
+        self._extract(exporter=self._slack_exporter())
         self._transform()
+        self._index()
         self._load(uploader=GoogleDriveUploader(credentials=self.credentials))
+        self._commit_snapshot()
+
+class SlackToS3(ETL):
+    """Slack ETL process that uploads data to an S3-compatible object storage, under the remote_dir key prefix."""
+
+    def plan(self) -> ExportPlan:
+        return self._plan(exporter=self._slack_exporter())
+
+    def run(self):
+        self._begin_snapshot()
+        self._extract(exporter=self._slack_exporter())
+        self._transform()
+        self._index()
+        self._load(uploader=S3Uploader(credentials=self.credentials))
+        self._commit_snapshot()
 
 class SlackToLocal(ETL):
     """Slack ETL process that saves data locally without uploading to cloud storage."""
 
+    def _backup_location(self) -> str:
+        return str(self.local_dir.resolve())
+
+    def plan(self) -> ExportPlan:
+        return self._plan(exporter=self._slack_exporter())
+
     def run(self):
-        self._extract(exporter=SlackExporter())
+        self._begin_snapshot()
+        self._extract(exporter=self._slack_exporter())
         self._transform()
+        self._index()
+        self._commit_snapshot()
         logger.info(f"Data saved locally at {self.local_dir}")
         return self.local_dir
     
@@ -137,3 +388,10 @@ class UploadFolderToGoogleDrive(ETL):
 
     def run(self):
         self._load(uploader=GoogleDriveUploader(credentials=self.credentials), cleanup=False)
+
+class VerifyGoogleDriveBackup(ETL):
+    """Verifies a backup uploaded to Google Drive against its manifest, using remote metadata only."""
+
+    def run(self):
+        if not self._verify(uploader=GoogleDriveUploader(credentials=self.credentials)):
+            raise Exception("Backup on Google Drive does not match its manifest")
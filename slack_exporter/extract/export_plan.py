@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ExportPlan:
+    """Projected cost of an export, estimated from metadata-only probes.
+
+    Attributes:
+        channels (int): The number of channels to export.
+        messages (int): The estimated number of messages to export.
+        files (int): The number of attachments to download.
+        api_calls (int): The projected number of rate limited Slack API calls. File downloads are not included.
+        download_bytes (int): The projected number of bytes downloaded from Slack.
+        upload_bytes (int): The projected number of bytes written to the export and uploaded.
+        wall_time (float): The projected duration of the export, in seconds.
+        probe_calls (int): The number of API calls made to build this plan.
+    """
+
+    channels: int = 0
+    messages: int = 0
+    files: int = 0
+    api_calls: int = 0
+    download_bytes: int = 0
+    upload_bytes: int = 0
+    wall_time: float = 0.0
+    probe_calls: int = 0
+
+    def __str__(self) -> str:
+        hours, remainder = divmod(int(self.wall_time), 3600)
+        return (
+            f"Export plan: {self.channels} channels, ~{self.messages} messages, {self.files} files\n"
+            f"  API calls:  ~{self.api_calls}\n"
+            f"  Wall time:  ~{hours}h{remainder // 60:02d}m\n"
+            f"  Download:   ~{self.download_bytes / 1e9:.2f} GB\n"
+            f"  Upload:     ~{self.upload_bytes / 1e9:.2f} GB\n"
+            f"  ({self.probe_calls} API calls made to build this plan)"
+        )
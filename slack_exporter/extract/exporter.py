@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from slack_exporter.extract.export_plan import ExportPlan
+
 
 class Exporter(ABC):
     """
@@ -25,7 +27,13 @@ class Exporter(ABC):
         pass
 
     @abstractmethod
-    def export(self, export_path: Path, file_suffix: str = None, oldest_timestamp: float = None) -> str:
+    def export(
+            self,
+            export_path: Path,
+            file_suffix: str = None,
+            oldest_timestamp: float = None,
+            shard: tuple[int, int] = None
+        ) -> str:
         """Exports all data and returns the path to the exported data.
         This method should be implemented by subclasses to handle specific export logic.
         
@@ -33,8 +41,22 @@ class Exporter(ABC):
             export_path (Path): The path where the exported data will be saved.
             file_suffix (str, optional): Optional suffix for files to be processed.
             oldest_timestamp (float, optional): Optional timestamp to filter data. If provided, only data older than this timestamp will be exported.
+            shard (tuple[int, int], optional): Optional 1-based shard index and number of shards. If provided, only the part of the data belonging to this shard will be exported.
             
         Returns:
             str: The path to the exported data.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def plan(self, oldest_timestamp: float = None, shard: tuple[int, int] = None) -> ExportPlan | None:
+        """Estimates the cost of an export without fetching its content.
+        Subclasses may implement this method to support dry runs.
+
+        Args:
+            oldest_timestamp (float, optional): Optional timestamp the export would start from.
+            shard (tuple[int, int], optional): Optional 1-based shard index and number of shards the export would cover.
+
+        Returns:
+            ExportPlan | None: The estimated cost of the export, or None if the exporter does not support planning.
+        """
+        return None
@@ -0,0 +1,30 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces out calls to an API by a minimum interval.
+
+    Attributes:
+        min_interval (float): The minimum number of seconds between two calls.
+    """
+
+    def __init__(self, min_interval: float = 1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_call = 0.0
+
+    def wait(self) -> None:
+        """Blocks until the next call is allowed."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.min_interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Delays all upcoming calls, e.g. after the API answered with a Retry-After header."""
+        with self._lock:
+            self._next_call = max(self._next_call, time.monotonic() + seconds)
@@ -0,0 +1,34 @@
+import zlib
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """Parses a shard specification such as `2/4` (the second of four shards).
+
+    Raises:
+        ValueError: If the specification is malformed or out of range.
+
+    Returns:
+        tuple[int, int]: The 1-based shard index and the number of shards.
+    """
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {shard}. Expected i/N, e.g. 1/4")
+
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {shard}. The shard index must be between 1 and {max(count, 1)}")
+
+    return index, count
+
+
+def channel_in_shard(channel_id: str, shard: tuple[int, int] | None) -> bool:
+    """Checks whether a channel belongs to a shard.
+
+    Channels are partitioned by a CRC32 of their ID, which is stable across machines and Python processes
+    (unlike the built-in `hash`), so every node computes the same disjoint partition.
+    """
+    if not shard:
+        return True
+
+    index, count = shard
+    return zlib.crc32(channel_id.encode()) % count == index - 1
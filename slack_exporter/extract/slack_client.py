@@ -0,0 +1,127 @@
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from slack_exporter.extract.rate_limiter import RateLimiter
+from slack_exporter.logger_config import logger
+from slack_exporter.manifest import HashingWriter
+
+
+class SlackClient:
+    """Shared client for the Slack Web API.
+
+    It owns a pooled keep-alive session so that consecutive calls reuse the same TLS connections,
+    negotiates gzip responses, and applies the same timeouts, retry policy and rate limiting to every call.
+    Server errors and connection resets are retried with exponential backoff, while 429 responses pause the rate limiter
+    for the duration given by Slack in the Retry-After header.
+
+    Attributes:
+        token (str): The Slack bot token.
+        rate_limiter (RateLimiter): Spaces out API calls made with this token.
+        timeout (tuple[float, float]): The connect and read timeouts, in seconds.
+        max_retries (int): The maximum number of retries of a failed call.
+    """
+
+    BASE_URL = "https://slack.com/api/"
+
+    def __init__(
+            self,
+            token: str,
+            rate_limiter: RateLimiter = None,
+            timeout: tuple[float, float] = (10, 60),
+            max_retries: int = 5,
+            pool_size: int = 10
+        ):
+        self.token = token
+        self.rate_limiter = rate_limiter or RateLimiter(min_interval=1.0)
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=1,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+    def close(self) -> None:
+        self.session.close()
+
+    def call(self, method: str, params: dict = None) -> dict:
+        """Calls a Slack Web API method and returns its JSON payload.
+
+        Args:
+            method: The API method, e.g. `conversations.history`.
+            params: The query parameters of the call.
+
+        Raises:
+            HTTPError: if request status code >= 400 after all retries
+            RequestException: if the response content is unexpected or Slack returned an error
+
+        Returns:
+            dict: The payload of the response.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            response = self.session.get(self.BASE_URL + method, params=params, timeout=self.timeout)
+
+            if response.status_code == 429 and attempt < self.max_retries: # Rate limited
+                retry_after = int(response.headers.get('Retry-After', 60))
+                logger.warning(f"Rate limited on {method}. Waiting for {retry_after} seconds...")
+                self.rate_limiter.pause(retry_after)
+                continue
+
+            response.raise_for_status()
+            data = response.json()
+
+            if not data.get("ok"):
+                raise requests.exceptions.RequestException(f"Slack API error on {method}: {data.get('error')}")
+
+            return data
+
+    def download(self, url: str, file_path: Path, chunk_size: int = 1024 * 1024) -> dict:
+        """Streams a private Slack file to disk, computing its checksums on the fly.
+
+        Downloads interrupted by a connection reset are restarted from scratch, with exponential backoff.
+
+        Args:
+            url: The private download URL of the file.
+            file_path: The path where the file will be saved.
+            chunk_size: The size of the chunks written to disk.
+
+        Raises:
+            HTTPError: if request status code >= 400 after all retries
+            ConnectionError: if the connection failed after all retries
+
+        Returns:
+            dict: The size, SHA-256 and MD5 of the downloaded file.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+
+                    with open(file_path, 'wb') as f_out:
+                        writer = HashingWriter(f_out)
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            writer.write(chunk)
+
+                    return writer.checksum
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Download of {file_path.name} interrupted ({e}). Retrying...")
+                time.sleep(2 ** attempt)
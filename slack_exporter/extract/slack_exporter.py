@@ -1,12 +1,22 @@
 import json
+import math
 import os
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
 
+from slack_exporter.extract.export_plan import ExportPlan
 from slack_exporter.extract.exporter import Exporter
+from slack_exporter.extract.rate_limiter import RateLimiter
+from slack_exporter.extract.slack_client import SlackClient
+from slack_exporter.extract.sharding import channel_in_shard
 from slack_exporter.logger_config import logger
+from slack_exporter.manifest import Manifest
+from slack_exporter.transform.layout import Layout, get_layout
+from slack_exporter.transform.tools import add_suffix_to_filename
 
 class SlackExporter(Exporter):
     """Class to export Slack channels history and files.
@@ -17,11 +27,58 @@ class SlackExporter(Exporter):
     Methods:
         authenticate(): Authenticates the Slack API using the bot token.
         get_channels_list(): Retrieves the list of channels in the workspace.
-        get_channel_history(channel_id, limit=15, cursor=None, messages=None): Retrieves the complete history of a channel with pagination.
+        get_channel_history(channel_id, limit=200, cursor=None, messages=None): Retrieves the complete history of a channel with pagination.
         download_attachments(): Downloads attachments from exported Slack messages.
-        export(): Exports all channels history and files."""
-
-    def __init__(self):
+        list_files(): Lists the metadata of the files shared in the workspace.
+        download_listed_files(): Downloads the files of the exported channels found with files.list.
+        plan(): Estimates the cost of an export without fetching its content.
+        export(): Exports all channels history and files.
+
+    Attributes:
+        slack_token (str): The Slack bot token. Defaults to the SLACK_BOT_TOKEN environment variable.
+        client (SlackClient): The pooled API client shared by all calls, rate limited per token.
+        transfer_slots (Semaphore): Optional semaphore shared between processes to cap concurrent downloads.
+        layout (Layout): Decides where messages and attachments are written. Defaults to attachments sorted by extension.
+        history_windows (int): The number of time windows fetched concurrently for channels with more than one page of history.
+        attachment_source (str): How attachments are found: `messages` scans the exported messages, `files_list`
+            enumerates the files of the exported channels with files.list, which supports the filters below.
+        file_types (str): Comma-separated files.list types to download in `files_list` mode, e.g. `images,pdfs`.
+        max_file_size (int): Files larger than this, in bytes, are skipped in `files_list` mode.
+        file_order (str): The order downloads are scheduled in `files_list` mode, `largest_first` or `smallest_first`.
+        strict (bool): Whether a channel whose history cannot be fetched entirely fails the export, instead of being
+            skipped or exported partially. Used by snapshots, which must not be recorded with missing messages."""
+
+    ATTACHMENT_SOURCES = ("messages", "files_list")
+    FILE_ORDERS = ("largest_first", "smallest_first")
+
+    def __init__(
+            self,
+            token: str = None,
+            rate_limiter: RateLimiter = None,
+            transfer_slots=None,
+            layout: str | Layout = None,
+            history_windows: int = 1,
+            attachment_source: str = "messages",
+            file_types: str = None,
+            max_file_size: int = None,
+            file_order: str = None,
+            strict: bool = False
+        ):
+        if attachment_source not in self.ATTACHMENT_SOURCES:
+            raise ValueError(f"Unknown attachment source: {attachment_source}. Expected one of {', '.join(self.ATTACHMENT_SOURCES)}")
+        if file_order and file_order not in self.FILE_ORDERS:
+            raise ValueError(f"Unknown file order: {file_order}. Expected one of {', '.join(self.FILE_ORDERS)}")
+
+        self.slack_token = token if token is not None else os.getenv("SLACK_BOT_TOKEN")
+        self.client = SlackClient(token=self.slack_token, rate_limiter=rate_limiter)
+        self.transfer_slots = transfer_slots
+        self.layout = get_layout(layout)
+        self.history_windows = history_windows
+        self.attachment_source = attachment_source
+        self.file_types = file_types
+        self.max_file_size = max_file_size
+        self.file_order = file_order
+        self.strict = strict
         super().__init__()
 
     def authenticate(self) -> bool:
@@ -31,29 +88,16 @@ class SlackExporter(Exporter):
             Exception: if an unknown error occured
             HTTPError: if request status code >= 400
             RequestException: if the response content is unexpected
-            ValueError: if the given Slack Bot Token is invalid
+            ValueError: if no Slack Bot Token is given
         """
 
-        self.slack_token = os.getenv("SLACK_BOT_TOKEN")
-        self.headers = {"Authorization": f"Bearer {self.slack_token}"}
-
         if not self.slack_token:
-            raise ValueError("SLACK_BOT_TOKEN environment variable is not set")
+            raise ValueError("No Slack token given and SLACK_BOT_TOKEN environment variable is not set")
 
         try:
-            response = requests.get(
-                "https://slack.com/api/auth.test",
-                headers=self.headers
-            )
-            response.raise_for_status()
-
-            data = response.json()
-
-            if data.get("ok"):
-                logger.info("Slack authentication successful.")
-                return True
-            else:
-                raise requests.exceptions.RequestException(f"Slack authentication failed: {data.get('error')}")
+            self.client.call("auth.test")
+            logger.info("Slack authentication successful.")
+            return True
             
         except Exception as e:
             raise Exception(f"Error during Slack authentication: {e}")
@@ -66,35 +110,41 @@ class SlackExporter(Exporter):
             RequestException: if the response content is unexpected
         """
 
-        response = requests.get(
-            "https://slack.com/api/users.conversations",
-            headers=self.headers
-        )
-        response.raise_for_status()
+        channels = []
+        params = {"limit": 200}
 
-        data = response.json()
+        while True:
+            data = self.client.call("users.conversations", params=params)
+            channels.extend(data["channels"])
 
-        if data.get("ok"):
-            return data["channels"]
-        else:
-            raise requests.exceptions.RequestException(f"Slack API error: {data.get('error')}")
+            cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                return channels
+            params["cursor"] = cursor
         
     def get_channel_history(
             self, 
             channel_id: str, 
-            limit: int = 15, 
+            limit: int = 200, 
             cursor: str = None, 
             messages: list = None,
-            oldest_timestamp: float = 0
+            oldest_timestamp: float = 0,
+            windows: int = 1
         ) -> dict:
         """Retrieves the complete history of a channel with pagination.
 
+        With several windows, channels with more than one page of history are split into that many
+        `oldest`/`latest` time windows whose cursor chains are fetched concurrently, then merged and deduplicated by `ts`.
+        All windows share the client's rate limiter, so this shortens the critical path of large channels
+        as long as API latency, rather than the limiter's `min_interval`, is the bottleneck.
+
         Args:
             channel_id (str): The ID of the channel to retrieve history from.
             limit (int): The maximum number of messages to retrieve per request.
             cursor (str): The cursor for pagination, if any.
             messages (list): A list to accumulate messages across multiple requests.    
             oldest_timestamp (float): The timestamp to start retrieving messages from.
+            windows (int): The number of time windows fetched concurrently for channels with more than one page.
 
         Raises:
             Exception: if an unknown error occured
@@ -110,52 +160,15 @@ class SlackExporter(Exporter):
             messages = []
         
         try:
-            params = {
-                "channel": channel_id,
-                "limit": limit, 
-                "oldest": oldest_timestamp
-            }
-            if cursor:
-                params["cursor"] = cursor
-
-            response = requests.get(
-                "https://slack.com/api/conversations.history",
-                headers=self.headers,
-                params=params
-            )
-            
-            if response.status_code == 429: # Rate limited
-                retry_after = int(response.headers.get('Retry-After', 60))
-                logger.warning(f"Rate limited. Waiting for {retry_after} seconds...")
-                time.sleep(retry_after)
-
-
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get("ok"):
-                messages.extend(data.get("messages", []))
-                
-                if data.get("has_more"):
-                    cursor = data.get("response_metadata", {}).get("next_cursor")
-
-                    if cursor:
-                        logger.info(f"Next page for channel {channel_id}...")
-                        time.sleep(1)
-
-                        return self.get_history(
-                            channel_id=channel_id,
-                            limit=limit,
-                            oldest=oldest_timestamp,
-                            cursor=cursor,
-                            messages=messages
-                        )
-                
-                    else:
-                        logger.warning("has_more is true, but no next_cursor found. Stopping pagination.")
-
+            if windows > 1 and not cursor:
+                messages.extend(self._get_history_in_windows(channel_id, limit, oldest_timestamp, windows))
             else:
-                raise requests.exceptions.RequestException(f"Slack API error for channel {channel_id}: {data.get('error')}")
+                self._paginate_history(
+                    channel_id=channel_id,
+                    params={"limit": limit, "oldest": oldest_timestamp or 0},
+                    cursor=cursor,
+                    messages=messages
+                )
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Request error while retrieving history for {channel_id}: {e}")
@@ -166,16 +179,155 @@ class SlackExporter(Exporter):
         logger.info(f"{len(messages)} messages retrieved for channel {channel_id}.")
         return {"ok": True, "messages": messages, "has_more": False}
 
-    def download_attachments(self, export_path: Path, file_suffix: str = None) -> None:
+    def fetch_channel_history(
+            self,
+            channel_id: str,
+            oldest_timestamp: float | str = 0,
+            windows: int = 1,
+            limit: int = 200
+        ) -> list[dict]:
+        """Retrieves the messages of a channel posted after a timestamp, newest first.
+
+        Unlike `get_channel_history`, errors are raised instead of logged, so that a partial history
+        is never mistaken for a complete one.
+
+        Args:
+            channel_id (str): The ID of the channel to retrieve history from.
+            oldest_timestamp (float | str): The timestamp to start retrieving messages from, e.g. the `ts` of a message.
+            windows (int): The number of time windows fetched concurrently for channels with more than one page.
+            limit (int): The maximum number of messages to retrieve per request.
+
+        Raises:
+            HTTPError: if request status code >= 400
+            RequestException: if the response content is unexpected
+
+        Returns:
+            list[dict]: The messages of the channel.
+        """
+
+        if windows > 1:
+            return self._get_history_in_windows(channel_id, limit, oldest_timestamp, windows)
+
+        messages, _ = self._paginate_history(
+            channel_id=channel_id,
+            params={"limit": limit, "oldest": oldest_timestamp or 0}
+        )
+        return messages
+
+    def _paginate_history(
+            self,
+            channel_id: str,
+            params: dict,
+            cursor: str = None,
+            messages: list = None,
+            max_pages: int = None
+        ) -> tuple[list, bool]:
+        """Follows the cursor chain of conversations.history for the given query parameters.
+
+        Returns:
+            tuple[list, bool]: The accumulated messages, and whether more pages were left after `max_pages`.
+        """
+
+        if messages is None:
+            messages = []
+        params = {**params, "channel": channel_id}
+        pages = 0
+
+        while True:
+            if cursor:
+                params["cursor"] = cursor
+
+            data = self.client.call("conversations.history", params=params)
+            messages.extend(data.get("messages", []))
+            pages += 1
+
+            if not data.get("has_more"):
+                return messages, False
+
+            cursor = data.get("response_metadata", {}).get("next_cursor")
+            if not cursor:
+                logger.warning("has_more is true, but no next_cursor found. Stopping pagination.")
+                return messages, False
+
+            if max_pages and pages >= max_pages:
+                return messages, True
+
+            logger.info(f"Next page for channel {channel_id}...")
+
+    def _get_history_in_windows(self, channel_id: str, limit: int, oldest_timestamp: float | str, windows: int) -> list:
+        """Fetches the first page of a channel, then the rest of its history in concurrent time windows.
+
+        Returns:
+            list: The messages of the channel, newest first, without duplicates.
+        """
+
+        first_page, has_more = self._paginate_history(
+            channel_id=channel_id,
+            params={"limit": limit, "oldest": oldest_timestamp or 0},
+            max_pages=1
+        )
+        if not has_more:
+            return first_page
+
+        # Timestamps may be given as the `ts` string of a message
+        requested_oldest = oldest_timestamp = float(oldest_timestamp or 0)
+        if not oldest_timestamp:
+            info = self.client.call("conversations.info", params={"channel": channel_id})
+            oldest_timestamp = float(info["channel"].get("created", 0))
+
+        # Messages are returned newest first, so the first page ends at the newest message left to fetch
+        latest_timestamp = float(first_page[-1]["ts"])
+        step = (latest_timestamp - oldest_timestamp) / windows
+        bounds = [
+            (oldest_timestamp + i * step, latest_timestamp if i == windows - 1 else oldest_timestamp + (i + 1) * step)
+            for i in range(windows)
+        ]
+        logger.info(f"Fetching history of channel {channel_id} in {windows} time windows...")
+
+        # Window bounds are inclusive so that no message falls between two windows, duplicates are merged below
+        with ThreadPoolExecutor(max_workers=windows) as executor:
+            results = executor.map(
+                lambda window: self._paginate_history(
+                    channel_id=channel_id,
+                    params={
+                        "limit": limit,
+                        "oldest": f"{window[0]:.6f}",
+                        "latest": f"{window[1]:.6f}",
+                        "inclusive": "true"
+                    }
+                )[0],
+                bounds
+            )
+
+            unique = {message["ts"]: message for message in first_page}
+            for window_messages in results:
+                unique.update((message["ts"], message) for message in window_messages)
+
+        # Like a single cursor chain, exclude messages posted exactly at the requested oldest timestamp
+        if requested_oldest:
+            unique = {ts: message for ts, message in unique.items() if float(ts) > requested_oldest}
+
+        return sorted(unique.values(), key=lambda message: float(message["ts"]), reverse=True)
+
+    def download_attachments(
+            self,
+            export_path: Path,
+            file_suffix: str = None,
+            manifest: Manifest = None,
+            message_files: list[tuple[str, Path]] = None
+        ) -> None:
         """Downloads attachments from exported Slack messages.
 
-        This method iterates through all JSON files in the export path, checks for messages with attachments,
-        and downloads each attachment to a corresponding directory named after the channel.
+        This method iterates through the message files of the export, checks for messages with attachments,
+        and downloads each attachment where the layout puts the attachments of its channel.
         The downloaded files will have a suffix added before the file extension if specified.
         
         Args:
             export_path (Path): The path where the exported data is stored.
             file_suffix (str): A suffix to add to the filenames of downloaded attachments.
+            manifest (Manifest): Optional manifest where the checksums of the downloaded files are recorded.
+            message_files (list[tuple[str, Path]]): The channel names and paths of the message files to scan.
+                Defaults to all the message files of the export.
 
         Raises:
             Exception: if an unknown error occured
@@ -185,15 +337,12 @@ class SlackExporter(Exporter):
 
         logger.info(f"Starting attachment download for {export_path}...")
 
-        for json_file in export_path.rglob("*.json"):
-            if json_file.name == "channels.json":
-                continue
+        if message_files is None:
+            message_files = self.layout.iter_message_files(export_path)
 
+        for channel_name, json_file in message_files:
             try:
-                with open(json_file, 'r') as f:
-                    data = json.load(f)
-                
-                messages = data.get("messages", [])
+                messages = self.layout.read_messages(json_file)
                 
                 for message in messages:
                     if "files" in message:
@@ -201,32 +350,21 @@ class SlackExporter(Exporter):
                             if "url_private_download" in file_info:
                                 download_url = file_info["url_private_download"]
 
-                                # Insert file_suffix before the file extension
-                                original_name = file_info["name"]
-                                if file_suffix:
-                                    if "." in original_name:
-                                        basename, extension = original_name.rsplit(".", 1)
-                                        file_name = basename + file_suffix + "." + extension
-                                    else:
-                                        file_name = original_name + file_suffix                     
-                                else:
-                                    file_name = original_name
-
-                                relative_path = json_file.relative_to(export_path)
-                                channel_name = relative_path.stem
-
-                                attachment_dir = export_path / channel_name
-                                attachment_dir.mkdir(parents=True, exist_ok=True)
-                                
-                                file_path = attachment_dir / file_name
+                                file_name = add_suffix_to_filename(file_info["name"], file_suffix)
+
+                                file_path = self.layout.attachment_path(export_path, channel_name, file_name)
+                                file_path.parent.mkdir(parents=True, exist_ok=True)
                                 
                                 try:
-                                    response = requests.get(download_url, headers=self.headers, stream=True)
-                                    response.raise_for_status()
-                                    
-                                    with open(file_path, 'wb') as f_out:
-                                        for chunk in response.iter_content(chunk_size=8192):
-                                            f_out.write(chunk)
+                                    if self.transfer_slots:
+                                        self.transfer_slots.acquire()
+                                    try:
+                                        checksum = self.client.download(download_url, file_path)
+                                    finally:
+                                        if self.transfer_slots:
+                                            self.transfer_slots.release()
+                                    if manifest:
+                                        manifest.add_file(file_path.relative_to(export_path).as_posix(), checksum)
                                     logger.info(f"Downloaded attachment: {file_path}")
                                     
                                 except requests.exceptions.RequestException as e:
@@ -238,17 +376,268 @@ class SlackExporter(Exporter):
         
         logger.info("Attachment download complete.")
 
+    def list_files(
+            self,
+            ts_from: float = None,
+            ts_to: float = None,
+            channel_id: str = None,
+            types: str = None
+        ) -> list[dict]:
+        """Lists the metadata of the files shared in the workspace, with pagination.
+
+        Args:
+            ts_from (float): Only list files created after this timestamp.
+            ts_to (float): Only list files created before this timestamp.
+            channel_id (str): Only list files shared in this channel.
+            types (str): Only list files of these comma-separated types, e.g. `images,pdfs`.
+
+        Raises:
+            HTTPError: if request status code >= 400
+            RequestException: if the response content is unexpected
+
+        Returns:
+            list[dict]: The file objects, including their size, type and channels.
+        """
+
+        params = {"count": 200, "page": 1}
+        if ts_from:
+            params["ts_from"] = int(ts_from)
+        if ts_to:
+            params["ts_to"] = int(ts_to)
+        if channel_id:
+            params["channel"] = channel_id
+        if types:
+            params["types"] = types
+
+        files = []
+        while True:
+            data = self.client.call("files.list", params=params)
+            files.extend(data.get("files", []))
+
+            if params["page"] >= data.get("paging", {}).get("pages", 1):
+                return files
+            params["page"] += 1
+
+    def _select_files(self, files: list[dict], channel_ids: set[str]) -> list[dict]:
+        """Keeps the listed files of the given channels that `files_list` downloads, in download order.
+
+        Files without a download URL, such as external links, and files larger than `max_file_size` are left out.
+        """
+
+        files = [
+            file_info for file_info in files
+            if "url_private_download" in file_info
+            and channel_ids & set(self._file_channels(file_info))
+            and not (self.max_file_size and file_info.get("size", 0) > self.max_file_size)
+        ]
+
+        if self.file_order:
+            files.sort(key=lambda file_info: file_info.get("size", 0), reverse=self.file_order == "largest_first")
+
+        return files
+
+    @staticmethod
+    def _file_channels(file_info: dict) -> list[str]:
+        return file_info.get("channels", []) + file_info.get("groups", []) + file_info.get("ims", [])
+
+    def download_listed_files(
+            self,
+            export_path: Path,
+            channels: dict[str, str],
+            file_suffix: str = None,
+            oldest_timestamp: float = None,
+            manifest: Manifest = None,
+            files: list[dict] = None
+        ) -> None:
+        """Downloads the files of the exported channels found with files.list, without reading the exported messages.
+
+        Each file is downloaded once, where the layout puts the attachments of the first exported channel it was
+        shared in, and copied to the other exported channels it was shared in.
+
+        Args:
+            export_path (Path): The path where the exported data is stored.
+            channels (dict[str, str]): The names of the exported channels by ID.
+            file_suffix (str): A suffix to add to the filenames of downloaded attachments.
+            oldest_timestamp (float): Only download files created after this timestamp.
+            manifest (Manifest): Optional manifest where the checksums of the downloaded files are recorded.
+            files (list[dict]): The files already listed with `list_files`, if any. They are still filtered and ordered.
+
+        Raises:
+            HTTPError: if request status code >= 400
+            RequestException: if the response content is unexpected
+        """
+
+        # The whole workspace is listed once and filtered locally, which takes fewer calls than listing each channel
+        if files is None:
+            files = self.list_files(ts_from=oldest_timestamp, types=self.file_types)
+        files = self._select_files(files, set(channels))
+        logger.info(
+            f"Downloading {len(files)} files listed with files.list, "
+            f"{sum(file_info.get('size', 0) for file_info in files)} bytes..."
+        )
+
+        for file_info in files:
+            file_name = add_suffix_to_filename(file_info["name"], file_suffix)
+            paths = [
+                self.layout.attachment_path(export_path, channels[channel_id], file_name)
+                for channel_id in self._file_channels(file_info) if channel_id in channels
+            ]
+            paths[0].parent.mkdir(parents=True, exist_ok=True)
+
+            try:
+                if self.transfer_slots:
+                    self.transfer_slots.acquire()
+                try:
+                    checksum = self.client.download(file_info["url_private_download"], paths[0])
+                finally:
+                    if self.transfer_slots:
+                        self.transfer_slots.release()
+
+            except requests.exceptions.RequestException as e:
+                raise requests.exceptions.RequestException(f"Error downloading {file_name}: {e}")
+
+            for path in paths[1:]:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(paths[0], path)
+
+            if manifest:
+                for path in paths:
+                    manifest.add_file(path.relative_to(export_path).as_posix(), checksum)
+            logger.info(f"Downloaded attachment: {paths[0]}")
+
+        logger.info("Attachment download complete.")
+
+    def plan(
+            self,
+            oldest_timestamp: float = None,
+            shard: tuple[int, int] = None,
+            samples: int = 3,
+            window: float = 86400,
+            bandwidth: float = 10 * 1000000,
+            sample_pages: int = 5
+        ) -> ExportPlan:
+        """Estimates the cost of an export without fetching its content.
+
+        Message counts are extrapolated from a few sampled time windows per channel, and attachment sizes are
+        read from the files.list metadata. Wall time accounts for the rate limiter interval between API calls and
+        for the transfer of the downloaded and uploaded bytes at the given bandwidth. File downloads are not
+        rate limited, so they only count as transferred bytes.
+
+        Samples of busy channels are paginated up to `sample_pages` pages. When a sample has more messages left,
+        the window is shrunk to the time range covered by the fetched pages.
+
+        Args:
+            oldest_timestamp (float): The timestamp the export would start retrieving messages from.
+            shard (tuple[int, int]): The 1-based shard index and number of shards the export would cover.
+            samples (int): The number of time windows sampled per channel.
+            window (float): The length of each sampled time window, in seconds.
+            bandwidth (float): The assumed download and upload bandwidth, in bytes per second.
+            sample_pages (int): The maximum number of pages of 999 messages fetched per sampled window.
+
+        Raises:
+            HTTPError: if request status code >= 400
+            RequestException: if the response content is unexpected
+
+        Returns:
+            ExportPlan: The projected number of API calls, wall time and bytes to transfer.
+        """
+
+        now = time.time()
+        plan = ExportPlan()
+
+        channels = self._select_channels(shard)
+        plan.channels = len(channels)
+        plan.probe_calls = plan.api_calls = math.ceil(len(channels) / 200) or 1
+
+        sampled_messages, sampled_bytes = 0, 0
+        for channel in channels:
+            start = oldest_timestamp or channel.get("created") or now
+            span = max(now - start, 0)
+            sample_window = min(window, span / samples) if span else 0
+
+            counted, covered = 0, 0
+            for k in range(samples if sample_window else 0):
+                center = start + (k + 0.5) * span / samples
+                sample_latest = center + sample_window / 2
+                messages, has_more = self._paginate_history(
+                    channel_id=channel["id"],
+                    params={"oldest": center - sample_window / 2, "latest": sample_latest, "limit": 999},
+                    max_pages=sample_pages
+                )
+                plan.probe_calls += max(math.ceil(len(messages) / 999), 1)
+
+                # Messages are returned newest first, so the fetched pages cover the end of the window
+                covered += sample_latest - float(messages[-1]["ts"]) if has_more else sample_window
+                counted += len(messages)
+                sampled_bytes += sum(len(json.dumps(message, indent=4)) for message in messages)
+
+            sampled_messages += counted
+            estimated = round(counted * span / covered) if covered else 0
+            plan.messages += estimated
+            plan.api_calls += max(math.ceil(estimated / 200), 1)
+
+            logger.info(f"Channel {channel['name']}: ~{estimated} messages")
+
+        channel_ids = {channel["id"] for channel in channels}
+        files_list = self.attachment_source == "files_list"
+        listed_files = self.list_files(ts_from=oldest_timestamp, types=self.file_types if files_list else None)
+        plan.probe_calls += math.ceil(len(listed_files) / 200) or 1
+
+        if files_list:
+            files = self._select_files(listed_files, channel_ids)
+        else:
+            files = [
+                file_info for file_info in listed_files
+                if channel_ids & set(self._file_channels(file_info))
+            ]
+
+        plan.files = len(files)
+        plan.download_bytes = sum(file_info.get("size", 0) for file_info in files)
+
+        average_message_size = sampled_bytes / sampled_messages if sampled_messages else 1000
+        plan.upload_bytes = plan.download_bytes + round(plan.messages * average_message_size)
+
+        plan.wall_time = (
+            plan.api_calls * self.client.rate_limiter.min_interval
+            + (plan.download_bytes + plan.upload_bytes) / bandwidth
+        )
+
+        return plan
+
+    def _select_channels(self, shard: tuple[int, int] = None) -> list:
+        """Retrieves the channels to export, restricted to the given shard if any.
+
+        Raises:
+            RuntimeWarning: if no channels where found in the Slack workspace
+        """
+
+        channels = self.get_channels_list()
+        if not channels:
+            raise RuntimeWarning("No channels found in the workspace. Please check your Slack token and permissions.")
+
+        if shard:
+            channels = [channel for channel in channels if channel_in_shard(channel["id"], shard)]
+            logger.info(f"Shard {shard[0]}/{shard[1]}: {len(channels)} channels.")
+
+        return channels
+
     def export(self, 
                export_path: Path, 
                file_suffix: str = None, 
-               oldest_timestamp: float = None
+               oldest_timestamp: float = None,
+               shard: tuple[int, int] = None
         ) -> Path | None:
         """Exports all channels history and files.
 
+        When a shard is given, only the channels whose ID hashes into this shard are exported, so that several
+        machines can each export a disjoint subset of the workspace. Each export writes a manifest listing its channels,
+        and the size and checksums of every file, computed while the files are written.
+
         Args:
             export_path (Path): The path where the exported data will be saved.
             file_suffix (str): A suffix to add to the filenames of downloaded attachments.
             oldest_timestamp (float): The timestamp to start retrieving messages from.
+            shard (tuple[int, int]): The 1-based shard index and number of shards to export.
 
         Raises:
             Exception: if an unknown error occured
@@ -265,9 +654,11 @@ class SlackExporter(Exporter):
         if not export_path.exists():
             export_path.mkdir(parents=True, exist_ok=True)
 
-        channels = self.get_channels_list()
-        if not channels:
-            raise RuntimeWarning("No channels found in the workspace. Please check your Slack token and permissions.")
+        channels = self._select_channels(shard)
+        manifest = Manifest(shard=shard)
+        exported_channels = {}
+        # Incremental runs may write into an existing export, only the files written by this run are scanned for attachments
+        message_files = []
 
         for channel in channels:
             channel_id = channel["id"]
@@ -275,28 +666,63 @@ class SlackExporter(Exporter):
             logger.info(f"Exporting channel: {channel_name} ({channel_id})")
 
             try:
-                history = self.get_channel_history(
-                    channel_id=channel_id, 
-                    oldest_timestamp=oldest_timestamp
+                if self.strict:
+                    messages = self.fetch_channel_history(
+                        channel_id=channel_id,
+                        oldest_timestamp=oldest_timestamp,
+                        windows=self.history_windows
                     )
+                else:
+                    messages = self.get_channel_history(
+                        channel_id=channel_id, 
+                        oldest_timestamp=oldest_timestamp,
+                        windows=self.history_windows
+                        )["messages"]
                 
-                channel_export_path = export_path / f"{channel_name}.json"
-                with open(channel_export_path, 'w') as f:
-                    json.dump(history, f, indent=4)
-                
-                logger.info(f"Channel {channel_name} exported to {channel_export_path}")
+                written = self.layout.write_channel(
+                    export_path=export_path,
+                    channel_name=channel_name,
+                    messages=messages,
+                    manifest=manifest
+                )
+
+                message_files.extend((channel_name, path) for path in written)
+
+                if written:
+                    exported_channels[channel_id] = channel_name
+                    channel_export_path = export_path / written[0].relative_to(export_path).parts[0]
+                    manifest.add_channel(
+                        channel_id=channel_id,
+                        name=channel_name,
+                        messages=len(messages),
+                        path=channel_export_path.name
+                    )
+                    logger.info(f"Channel {channel_name} exported to {channel_export_path}")
 
             except Exception as e:
                 logger.error(f"Failed to retrieve history for channel {channel_name}: {e}")
+                if self.strict:
+                    raise
                 continue
 
         try:
-            self.download_attachments(export_path, file_suffix)
+            if self.attachment_source == "files_list":
+                self.download_listed_files(
+                    export_path,
+                    channels=exported_channels,
+                    file_suffix=file_suffix,
+                    oldest_timestamp=oldest_timestamp,
+                    manifest=manifest
+                )
+            else:
+                self.download_attachments(export_path, file_suffix, manifest=manifest, message_files=message_files)
             
         except Exception as e:
             logger.error(f"Failed to download attachments.")
             raise
 
+        manifest.save(export_path)
+
         logger.info("Export completed successfully.")
 
         return export_path
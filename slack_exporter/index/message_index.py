@@ -0,0 +1,315 @@
+import argparse
+import json
+import sqlite3
+from pathlib import Path
+
+from slack_exporter.logger_config import logger
+from slack_exporter.transform.layout import Layout, get_layout
+from slack_exporter.transform.tools import add_suffix_to_filename
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    backup TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (backup, path)
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    channel TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    user TEXT,
+    thread_ts TEXT,
+    subtype TEXT,
+    text TEXT,
+    backup TEXT,
+    source TEXT NOT NULL,
+    UNIQUE (channel, ts)
+);
+CREATE INDEX IF NOT EXISTS messages_user ON messages (user, ts);
+CREATE INDEX IF NOT EXISTS messages_thread ON messages (channel, thread_ts);
+
+CREATE TABLE IF NOT EXISTS attachments (
+    file_id TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    name TEXT,
+    mimetype TEXT,
+    size INTEGER,
+    backup TEXT,
+    path TEXT,
+    PRIMARY KEY (file_id, channel, ts)
+);
+CREATE INDEX IF NOT EXISTS attachments_message ON attachments (channel, ts);
+"""
+
+# Indexes created before paths were stored relative to their backup hold absolute paths keyed by path only
+MIGRATION = """
+DROP TABLE sources;
+ALTER TABLE messages ADD COLUMN backup TEXT;
+ALTER TABLE attachments ADD COLUMN backup TEXT;
+"""
+
+
+class MessageIndex:
+    """Local SQLite index of exported Slack messages.
+
+    Messages are keyed by channel and `ts`, with user and thread lookups indexed. Attachment
+    references are linked to the path of the downloaded file inside the backup directory.
+    Paths are stored relative to the backup directory, along with the location of the backup, so that they stay
+    meaningful once the directory is uploaded and removed.
+    The index is updated incrementally: channel files that did not change since the last run are skipped
+    and messages are upserted, so it never needs to be rebuilt.
+
+    Attributes:
+        db_path (Path): The path to the SQLite database file.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.row_factory = sqlite3.Row
+
+        columns = [row["name"] for row in self.connection.execute("PRAGMA table_info(sources)")]
+        if columns and "backup" not in columns:
+            logger.info(f"Upgrading message index {self.db_path}, backups indexed before will be indexed again")
+            with self.connection:
+                self.connection.executescript(MIGRATION)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def update(
+            self,
+            backup_dir: Path,
+            file_suffix: str = None,
+            layout: str | Layout = None,
+            backup: str = None
+        ) -> int:
+        """Indexes the message files of a backup directory produced by `SlackExporter.export`.
+
+        Args:
+            backup_dir: The directory containing the exported message files.
+            file_suffix: The suffix that was added to attachment file names during export, if any.
+            layout: The layout of the backup directory. Defaults to attachments sorted by extension.
+            backup: The location of the backup recorded with its messages, e.g. the remote folder it is uploaded to.
+                Defaults to the absolute path of the backup directory.
+
+        Raises:
+            NotADirectoryError: If the backup directory does not exist.
+
+        Returns:
+            int: The number of messages added or updated.
+        """
+        backup_dir = Path(backup_dir)
+        if not backup_dir.is_dir():
+            raise NotADirectoryError(f"Backup folder not found or is not a directory: {backup_dir}")
+
+        backup = backup or str(backup_dir.resolve())
+        logger.info(f"Indexing messages from {backup_dir} into {self.db_path}...")
+
+        layout = get_layout(layout)
+        indexed = 0
+        for channel, json_file in layout.iter_message_files(backup_dir):
+            source = json_file.relative_to(backup_dir).as_posix()
+            stat = json_file.stat()
+            known = self.connection.execute(
+                "SELECT mtime, size FROM sources WHERE backup = ? AND path = ?", (backup, source)
+            ).fetchone()
+            if known and known["mtime"] == stat.st_mtime and known["size"] == stat.st_size:
+                continue
+
+            messages = layout.read_messages(json_file)
+
+            with self.connection:
+                indexed += self._index_messages(
+                    layout=layout,
+                    backup_dir=backup_dir,
+                    channel=channel,
+                    messages=messages,
+                    backup=backup,
+                    source=source,
+                    file_suffix=file_suffix
+                )
+                self.connection.execute(
+                    "INSERT INTO sources (backup, path, mtime, size) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (backup, path) DO UPDATE SET mtime = excluded.mtime, size = excluded.size",
+                    (backup, source, stat.st_mtime, stat.st_size)
+                )
+
+        logger.info(f"{indexed} messages indexed.")
+        return indexed
+
+    def _index_messages(
+            self,
+            layout: Layout,
+            backup_dir: Path,
+            channel: str,
+            messages: list[dict],
+            backup: str,
+            source: str,
+            file_suffix: str = None
+        ) -> int:
+        """Upserts the messages of a single channel and their attachments."""
+
+        for message in messages:
+            self.connection.execute(
+                "INSERT INTO messages (channel, ts, user, thread_ts, subtype, text, backup, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (channel, ts) DO UPDATE SET user = excluded.user, thread_ts = excluded.thread_ts, "
+                "subtype = excluded.subtype, text = excluded.text, backup = excluded.backup, source = excluded.source",
+                (
+                    channel,
+                    message["ts"],
+                    message.get("user"),
+                    message.get("thread_ts"),
+                    message.get("subtype"),
+                    message.get("text"),
+                    backup,
+                    source
+                )
+            )
+
+            for file_info in message.get("files", []):
+                if "id" not in file_info:
+                    continue
+
+                path = None
+                if "name" in file_info:
+                    path = self._find_attachment(
+                        backup_dir,
+                        layout.attachment_path(backup_dir, channel, add_suffix_to_filename(file_info["name"], file_suffix))
+                    )
+
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO attachments (file_id, channel, ts, name, mimetype, size, backup, path) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        file_info["id"],
+                        channel,
+                        message["ts"],
+                        file_info.get("name"),
+                        file_info.get("mimetype"),
+                        file_info.get("size"),
+                        backup,
+                        path
+                    )
+                )
+
+        return len(messages)
+
+    @staticmethod
+    def _find_attachment(backup_dir: Path, path: Path) -> str | None:
+        """Returns the path of a downloaded attachment relative to the backup directory, whether or not it was compressed."""
+        for candidate in (path, path.with_name(path.name + ".gz")):
+            if candidate.is_file():
+                return candidate.relative_to(backup_dir).as_posix()
+
+        return None
+
+    def query(
+            self,
+            channel: str = None,
+            user: str = None,
+            thread_ts: str = None,
+            oldest: float = None,
+            latest: float = None,
+            limit: int = 100
+        ) -> list[dict]:
+        """Returns indexed messages matching all of the given filters, newest first.
+
+        Args:
+            channel: The channel name.
+            user: The Slack user ID of the author.
+            thread_ts: The `ts` of the parent message of a thread.
+            oldest: Only return messages posted at or after this timestamp.
+            latest: Only return messages posted at or before this timestamp.
+            limit: The maximum number of messages to return.
+
+        Returns:
+            list[dict]: The matching messages, each with an `attachments` list.
+        """
+        clauses, params = [], []
+        for column, value in (("channel", channel), ("user", user), ("thread_ts", thread_ts)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if oldest is not None:
+            clauses.append("ts >= ?")
+            params.append(f"{oldest:.6f}")
+        if latest is not None:
+            clauses.append("ts <= ?")
+            params.append(f"{latest:.6f}")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.connection.execute(
+            f"SELECT channel, ts, user, thread_ts, subtype, text, backup, source FROM messages {where} "
+            "ORDER BY ts DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+
+        return [
+            {**dict(row), "attachments": self.get_attachments(row["channel"], row["ts"])}
+            for row in rows
+        ]
+
+    def get_attachments(self, channel: str, ts: str) -> list[dict]:
+        """Returns the attachments of a message with the path of the downloaded files in their backup, if found."""
+        rows = self.connection.execute(
+            "SELECT file_id, name, mimetype, size, backup, path FROM attachments WHERE channel = ? AND ts = ?",
+            (channel, ts)
+        ).fetchall()
+
+        return [dict(row) for row in rows]
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query or update the local index of exported Slack messages.")
+    parser.add_argument("--db", default="./slack_index.sqlite", help="Path to the SQLite index.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    update_parser = subparsers.add_parser("update", help="Index a backup directory.")
+    update_parser.add_argument("backup_dir", type=Path)
+    update_parser.add_argument("--file-suffix", default=None)
+    update_parser.add_argument("--layout", default=None, help="The layout of the backup: by_extension or slack.")
+    update_parser.add_argument("--backup", default=None, help="The location of the backup. Defaults to its absolute path.")
+
+    query_parser = subparsers.add_parser("query", help="Look up indexed messages.")
+    query_parser.add_argument("--channel")
+    query_parser.add_argument("--user")
+    query_parser.add_argument("--thread-ts")
+    query_parser.add_argument("--oldest", type=float)
+    query_parser.add_argument("--latest", type=float)
+    query_parser.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args(argv)
+
+    with MessageIndex(args.db) as index:
+        if args.command == "update":
+            index.update(args.backup_dir, file_suffix=args.file_suffix, layout=args.layout, backup=args.backup)
+        else:
+            for message in index.query(
+                channel=args.channel,
+                user=args.user,
+                thread_ts=args.thread_ts,
+                oldest=args.oldest,
+                latest=args.latest,
+                limit=args.limit
+            ):
+                print(json.dumps(message))
+
+
+if __name__ == "__main__":
+    main()
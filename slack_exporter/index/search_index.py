@@ -0,0 +1,142 @@
+import argparse
+import json
+from pathlib import Path
+
+from slack_exporter.index.message_index import MessageIndex
+
+
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE messages_fts USING fts5 (
+    text,
+    content = 'messages',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2',
+    columnsize = 0
+);
+
+CREATE TRIGGER messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, text) VALUES (new.id, coalesce(new.text, ''));
+END;
+
+CREATE TRIGGER messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.id, coalesce(old.text, ''));
+END;
+
+CREATE TRIGGER messages_fts_update AFTER UPDATE OF text ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.id, coalesce(old.text, ''));
+    INSERT INTO messages_fts (rowid, text) VALUES (new.id, coalesce(new.text, ''));
+END;
+"""
+
+
+class SearchIndex(MessageIndex):
+    """Message index with full-text search over message text.
+
+    The inverted index is an SQLite FTS5 table whose posting lists point at the rows of the `messages` table,
+    so the text itself is only stored once. It is kept in sync by triggers, which means it is extended
+    incrementally every time `update` indexes new or changed messages.
+    An existing message index is converted in place the first time it is opened as a search index.
+
+    Raises:
+        RuntimeError: If the SQLite library does not support FTS5.
+    """
+
+    def __init__(self, db_path: str | Path):
+        super().__init__(db_path)
+
+        exists = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+        ).fetchone()
+        if exists:
+            return
+
+        try:
+            with self.connection:
+                self.connection.executescript(SEARCH_SCHEMA)
+                self.connection.execute("INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')")
+        except Exception as e:
+            raise RuntimeError(f"Could not create full-text search index in {self.db_path}: {e}")
+
+    def search(
+            self,
+            text: str,
+            phrase: bool = False,
+            channel: str = None,
+            oldest: float = None,
+            latest: float = None,
+            limit: int = 100
+        ) -> list[dict]:
+        """Searches messages containing all the words of `text`, newest first.
+
+        Args:
+            text: The words to look for.
+            phrase: Whether the words must appear next to each other, in the given order.
+            channel: Only return messages from this channel.
+            oldest: Only return messages posted at or after this timestamp.
+            latest: Only return messages posted at or before this timestamp.
+            limit: The maximum number of messages to return.
+
+        Returns:
+            list[dict]: The matching messages, each with an `attachments` list.
+        """
+        words = text.split()
+        if not words:
+            return []
+
+        # Quote user input so that FTS5 operators in it are matched literally
+        if phrase:
+            match = '"' + " ".join(words).replace('"', '""') + '"'
+        else:
+            match = " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+        clauses, params = ["messages_fts MATCH ?"], [match]
+        if channel is not None:
+            clauses.append("messages.channel = ?")
+            params.append(channel)
+        if oldest is not None:
+            clauses.append("messages.ts >= ?")
+            params.append(f"{oldest:.6f}")
+        if latest is not None:
+            clauses.append("messages.ts <= ?")
+            params.append(f"{latest:.6f}")
+
+        rows = self.connection.execute(
+            "SELECT messages.channel, messages.ts, messages.user, messages.thread_ts, messages.subtype, "
+            "messages.text, messages.backup, messages.source FROM messages_fts "
+            "JOIN messages ON messages.id = messages_fts.rowid "
+            f"WHERE {' AND '.join(clauses)} ORDER BY messages.ts DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+
+        return [
+            {**dict(row), "attachments": self.get_attachments(row["channel"], row["ts"])}
+            for row in rows
+        ]
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Search the text of exported Slack messages.")
+    parser.add_argument("text", help="The words to look for.")
+    parser.add_argument("--db", default="./slack_index.sqlite", help="Path to the SQLite index.")
+    parser.add_argument("--phrase", action="store_true", help="Match the words as an exact phrase.")
+    parser.add_argument("--channel")
+    parser.add_argument("--oldest", type=float)
+    parser.add_argument("--latest", type=float)
+    parser.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args(argv)
+
+    with SearchIndex(args.db) as index:
+        for message in index.search(
+            text=args.text,
+            phrase=args.phrase,
+            channel=args.channel,
+            oldest=args.oldest,
+            latest=args.latest,
+            limit=args.limit
+        ):
+            print(json.dumps(message))
+
+
+if __name__ == "__main__":
+    main()
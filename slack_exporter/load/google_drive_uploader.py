@@ -1,4 +1,6 @@
+import json
 import os
+from collections import defaultdict
 from pathlib import Path
 
 from google.auth.transport.requests import Request
@@ -9,6 +11,7 @@ from googleapiclient.http import MediaFileUpload
 
 from slack_exporter.load.uploader import Uploader
 from slack_exporter.logger_config import logger
+from slack_exporter.manifest import MANIFEST_PREFIX, Manifest
 
 
 class GoogleDriveUploader(Uploader):
@@ -16,9 +19,13 @@ class GoogleDriveUploader(Uploader):
 
     Attributes:
         credentials (str): The path to the OAuth 2.0 credentials JSON file.
+        uploaded_files (dict[str, dict[str, str]]): The IDs of the files created by `upload_folder` by relative path,
+            for each uploaded local folder. Uploading a folder again creates new files next to the previous ones,
+            so verification checks these files rather than whichever file has the same path.
     """
 
     def __init__(self, credentials: str = './credentials.json'):
+        self.uploaded_files = {}
         super().__init__(credentials)
 
     def authenticate(self, credentials: str) -> bool:
@@ -69,7 +76,7 @@ class GoogleDriveUploader(Uploader):
             
             # Create the root folder on Drive
             root_folder_metadata = {
-                'name': str(local_folder_path),
+                'name': local_folder_path.name,
                 'parents': [remote_folder_id],
                 'shared_drive_id': remote_folder_id if remote_folder_id else None,
                 'mimeType': 'application/vnd.google-apps.folder'
@@ -107,6 +114,7 @@ class GoogleDriveUploader(Uploader):
                 logger.info(f"Folder created on Drive: {new_folder_id}")
 
         logger.info("Uploading files...")
+        uploaded_files = self.uploaded_files[str(local_folder_path.resolve())] = {}
         for root, _, files in os.walk(local_folder_path):
             resolved_root = str(Path(root).resolve())
             parent_folder_id = path_to_drive_id[resolved_root]
@@ -120,13 +128,14 @@ class GoogleDriveUploader(Uploader):
                 }
                 
                 media = MediaFileUpload(file_path, resumable=True)
-                self.service.files().create(
+                uploaded_file = self.service.files().create(
                     body=file_metadata,
                     media_body=media,
                     fields='id'
                 ).execute()
                 
-                relative_path = os.path.relpath(file_path, local_folder_path)
+                relative_path = Path(file_path).relative_to(local_folder_path).as_posix()
+                uploaded_files[relative_path] = uploaded_file.get('id')
                 logger.info(f"File uploaded: {relative_path}")
         
         logger.info(f"Full folder uploaded to Google Drive: {remote_folder_id}")
@@ -146,4 +155,75 @@ class GoogleDriveUploader(Uploader):
         folders = response.get('files', [])
 
         return folders[0].get('id') if folders else None
-    
\ No newline at end of file
+
+    def verify(self, local_folder_path: Path, remote_folder_id: str = "", manifest: Manifest = None) -> list[str]:
+        """Compares the md5Checksum and size of the uploaded files with the manifest.
+
+        If the folder was uploaded by this uploader, the files it created are checked. Otherwise, the files are found by
+        path, and paths shared by several files, left by previous uploads of a folder with the same name, are reported
+        as ambiguous rather than checked against any of them.
+        If no manifest is given and the local folder is gone, the manifest uploaded with the folder is used.
+
+        Returns:
+            list[str]: A description of every missing, ambiguous or mismatching file. Empty if the upload is intact.
+        """
+        root_folder_id = self._find_folder_id_by_name(local_folder_path.name, remote_folder_id)
+        if not root_folder_id:
+            return [f"Folder {local_folder_path.name} not found on Google Drive"]
+
+        listed_files = self._list_files_recursively(root_folder_id)
+
+        uploaded_ids = set(self.uploaded_files.get(str(local_folder_path.resolve()), {}).values())
+        if uploaded_ids:
+            listed_files = {
+                path: [item for item in items if item["id"] in uploaded_ids]
+                for path, items in listed_files.items()
+            }
+
+        remote_files = {path: items[0] for path, items in listed_files.items() if len(items) == 1}
+        ambiguous = {path for path, items in listed_files.items() if len(items) > 1}
+
+        if not manifest:
+            manifest = Manifest.find(local_folder_path) if local_folder_path.is_dir() else None
+        if not manifest:
+            manifest_files = [path for path in listed_files if path.startswith(f"{MANIFEST_PREFIX}manifest")]
+            if not manifest_files:
+                return [f"No manifest found in {local_folder_path.name} on Google Drive"]
+            if manifest_files[0] in ambiguous:
+                return [f"Several manifests named {manifest_files[0]} found in {local_folder_path.name} on Google Drive"]
+
+            content = self.service.files().get_media(fileId=remote_files[manifest_files[0]]["id"]).execute()
+            manifest = Manifest.from_dict(json.loads(content))
+
+        logger.info(f"Verifying {len(manifest.files)} files on Google Drive...")
+        problems = [
+            f"Ambiguous file: {path} was uploaded several times to {local_folder_path.name} on Google Drive"
+            for path in sorted(ambiguous) if path in manifest.files
+        ]
+        # Ambiguous files are reported above only, they have no metadata to compare
+        return problems + manifest.verify({**remote_files, **{path: {} for path in ambiguous}}, compare=("size", "md5"))
+
+    def _list_files_recursively(self, folder_id: str, prefix: str = "") -> dict[str, list[dict]]:
+        """Lists the files of a Drive folder and its subfolders by relative path, with their id, size and md5.
+        Drive allows several files and folders with the same name, so each path may hold several files."""
+        files = defaultdict(list)
+        page_token = None
+
+        while True:
+            response = self.service.files().list(
+                q=f"'{folder_id}' in parents and trashed = false",
+                fields='nextPageToken, files(id, name, mimeType, size, md5Checksum)',
+                pageToken=page_token
+            ).execute()
+
+            for item in response.get('files', []):
+                path = prefix + item['name']
+                if item['mimeType'] == 'application/vnd.google-apps.folder':
+                    for sub_path, items in self._list_files_recursively(item['id'], prefix=path + "/").items():
+                        files[sub_path].extend(items)
+                else:
+                    files[path].append({"id": item['id'], "size": item.get('size'), "md5": item.get('md5Checksum')})
+
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return files
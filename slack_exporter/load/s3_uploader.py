@@ -0,0 +1,179 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from slack_exporter.load.uploader import Uploader
+from slack_exporter.logger_config import logger
+from slack_exporter.manifest import Manifest
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.exceptions import ClientError
+except ImportError:
+    boto3 = None
+
+
+class S3Uploader(Uploader):
+    """This class handles uploading files to Amazon S3 or any S3-compatible object storage, such as MinIO.
+    It requires the optional `boto3` dependency.
+
+    Large files are sent as multipart uploads whose parts are uploaded in parallel, and several files are uploaded
+    at once. Files are streamed from disk, and files whose ETag already matches the remote object are skipped.
+
+    Attributes:
+        credentials (dict[str, str]): A dictionary containing the 'bucket' and optionally 'endpoint_url', 'region_name',
+            'aws_access_key_id' and 'aws_secret_access_key'. Missing keys fall back to the usual AWS configuration.
+        part_size (int): The size of the parts of multipart uploads, in bytes. Files larger than this are uploaded in parts.
+        max_concurrency (int): The number of parts uploaded in parallel for each file.
+        max_files (int): The number of files uploaded in parallel.
+    """
+
+    def __init__(
+            self,
+            credentials: dict[str, str],
+            part_size: int = 16 * 1024 * 1024,
+            max_concurrency: int = 8,
+            max_files: int = 4
+        ):
+        if boto3 is None:
+            raise ImportError("boto3 is required to upload to S3. Install it with `pip install boto3`.")
+
+        self.part_size = part_size
+        self.max_files = max_files
+        self.transfer_config = TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=max_concurrency,
+            use_threads=True
+        )
+        super().__init__(credentials)
+
+    def authenticate(self, credentials: dict[str, str]) -> bool:
+        """Creates the S3 client and checks that the bucket is reachable.
+
+        Raises:
+            ConnectionError: if the bucket cannot be accessed with the given credentials.
+
+        Returns:
+            bool: True if authentication was successful.
+        """
+        try:
+            self.bucket = credentials["bucket"]
+            self.client = boto3.client(
+                "s3",
+                endpoint_url=credentials.get("endpoint_url"),
+                region_name=credentials.get("region_name"),
+                aws_access_key_id=credentials.get("aws_access_key_id"),
+                aws_secret_access_key=credentials.get("aws_secret_access_key")
+            )
+            self.client.head_bucket(Bucket=self.bucket)
+            return True
+
+        except Exception as e:
+            raise ConnectionError(f"Could not access S3 bucket: {e}")
+
+    def upload_folder(self, local_folder_path: Path, remote_folder_id: str = "") -> bool:
+        """Uploads a folder and its structure under a key prefix of the bucket.
+
+        Args:
+            local_folder_path: The local path to the folder to upload.
+            remote_folder_id: The key prefix under which the folder is uploaded, e.g. `backups/slack`.
+
+        Raises:
+            ClientError: Any error returned by the storage service.
+
+        Returns:
+            bool: True if the upload was successful.
+        """
+        local_folder_path = Path(local_folder_path)
+        manifest = Manifest.find(local_folder_path)
+        prefix = self._prefix(local_folder_path, remote_folder_id)
+
+        logger.info(f"Uploading folder {local_folder_path} to s3://{self.bucket}/{prefix}...")
+
+        files = [
+            Path(root) / file_name
+            for root, _, file_names in os.walk(local_folder_path)
+            for file_name in file_names
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_files) as executor:
+            uploaded = list(executor.map(
+                lambda file_path: self._upload_file(file_path, local_folder_path, prefix, manifest),
+                files
+            ))
+
+        logger.info(f"{sum(uploaded)} files uploaded, {len(uploaded) - sum(uploaded)} already up to date.")
+        return True
+
+    def _upload_file(self, file_path: Path, local_folder_path: Path, prefix: str, manifest: Manifest = None) -> bool:
+        """Uploads a single file unless the remote object has the same ETag. Returns False if it was skipped."""
+        relative_path = file_path.relative_to(local_folder_path).as_posix()
+        key = prefix + relative_path
+
+        try:
+            remote_etag = self.client.head_object(Bucket=self.bucket, Key=key)["ETag"].strip('"')
+        except ClientError:
+            remote_etag = None
+
+        known = manifest.files.get(relative_path) if manifest else None
+        if remote_etag and remote_etag == self._etag(file_path, known):
+            logger.info(f"File already up to date: {relative_path}")
+            return False
+
+        self.client.upload_file(str(file_path), self.bucket, key, Config=self.transfer_config)
+        logger.info(f"File uploaded: {relative_path}")
+        return True
+
+    def _etag(self, file_path: Path, checksum: dict = None) -> str:
+        """Computes the ETag S3 gives to an object uploaded with this uploader's part size.
+
+        Single-part uploads have the MD5 of the file as ETag, which is taken from the manifest when known.
+        Multipart uploads have the MD5 of the concatenated MD5s of their parts, followed by the number of parts.
+        """
+        size = file_path.stat().st_size
+        if size < self.part_size:
+            if checksum and checksum.get("size") == size:
+                return checksum["md5"]
+
+            with open(file_path, 'rb') as f:
+                return hashlib.md5(f.read()).hexdigest()
+
+        part_digests = []
+        with open(file_path, 'rb') as f:
+            for part in iter(lambda: f.read(self.part_size), b""):
+                part_digests.append(hashlib.md5(part).digest())
+
+        return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+    def verify(self, local_folder_path: Path, remote_folder_id: str = "", manifest: Manifest = None) -> list[str]:
+        """Compares the size and, for single-part uploads, the MD5 ETag of the uploaded objects with the manifest.
+
+        Returns:
+            list[str]: A description of every missing or mismatching file. Empty if the upload is intact.
+        """
+        local_folder_path = Path(local_folder_path)
+        manifest = manifest or Manifest.find(local_folder_path)
+        if not manifest:
+            return [f"No manifest found in {local_folder_path}"]
+
+        prefix = self._prefix(local_folder_path, remote_folder_id)
+        remote_files = {}
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                etag = item["ETag"].strip('"')
+                remote_files[item["Key"][len(prefix):]] = {
+                    "size": item["Size"],
+                    "md5": etag if "-" not in etag else None
+                }
+
+        logger.info(f"Verifying {len(manifest.files)} files on S3...")
+        return manifest.verify(remote_files, compare=("size", "md5"))
+
+    @staticmethod
+    def _prefix(local_folder_path: Path, remote_folder_id: str = "") -> str:
+        """Returns the key prefix of an uploaded folder, which keeps the folder name like the other uploaders."""
+        parts = [part for part in (remote_folder_id or "").strip("/").split("/") if part]
+        return "/".join([*parts, Path(local_folder_path).name]) + "/"
@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from pathlib import Path
+
+from slack_exporter.manifest import Manifest
 
 
 class Uploader(ABC):
@@ -41,4 +44,19 @@ class Uploader(ABC):
         Returns:
             bool: True if the upload was successful, False otherwise
         """
-        ...
\ No newline at end of file
+        ...
+
+    def verify(self, local_folder_path: Path, remote_folder_id: str = "", manifest: Manifest = None) -> list[str] | None:
+        """Checks an uploaded folder against its manifest using remote metadata only, without downloading any content.
+        Subclasses may implement this method when their storage exposes file sizes or checksums.
+
+        Args:
+            local_folder_path (Path): The local path of the uploaded folder.
+            remote_folder_id (str, optional): The ID of the remote folder where the local folder was uploaded.
+            manifest (Manifest, optional): The manifest of the folder. Defaults to the manifest of the local folder.
+
+        Returns:
+            list[str] | None: A description of every missing or mismatching file, empty if the upload is intact,
+                or None if the storage service does not support verification.
+        """
+        return None
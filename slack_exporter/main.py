@@ -1,12 +1,15 @@
+import argparse
 import os
 from datetime import datetime, timedelta
 from dotenv import load_dotenv, find_dotenv
 
+from slack_exporter.extract.sharding import parse_shard
 from slack_exporter.logger_config import logger
 from slack_exporter.etl import (
     SlackToGoogleDrive, 
     SlackToLocal,
     SlackToMega,
+    SlackToS3,
     UploadFolderToGoogleDrive
 )
 
@@ -22,11 +25,33 @@ mega_credentials = {
     "password": os.getenv("MEGA_PASSWORD")
 }
 
+# S3 CONFIG
+s3_credentials = {
+    "bucket": os.getenv("S3_BUCKET"),
+    "endpoint_url": os.getenv("S3_ENDPOINT_URL"), # e.g. http://localhost:9000 for a local MinIO
+    "aws_access_key_id": os.getenv("S3_ACCESS_KEY_ID"),
+    "aws_secret_access_key": os.getenv("S3_SECRET_ACCESS_KEY")
+}
+
 # GOOGLE DRIVE CONFIG
 google_drive_parent_dir = os.getenv("GOOGLE_DRIVE_PARENT_FOLDER_ID")
 google_drive_credentials_path = os.getenv("GOOGLE_DRIVE_CREDENTIALS_PATH")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Back up a Slack workspace.")
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        help="Only export the i-th of N disjoint subsets of channels, e.g. 2/4, to spread an export across machines."
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Only estimate the API calls, time and bytes the export would take, without exporting anything."
+    )
+    args = parser.parse_args()
+
     logger.info("=== Starting Slack backup ===")
 
     # Uncomment the lines below to run the export of your choice
@@ -38,13 +63,19 @@ if __name__ == "__main__":
     # ).run()
 
     # Export all in a slack_backup folder, add a timestamp as a suffix to each file and upload at the root of the Mega directory.
-    SlackToMega(
+    etl = SlackToMega(
         local_dir="./slack_backup",
         remote_dir="",
         credentials=mega_credentials,
         file_suffix=f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-        oldest_timestamp=oldest_timestamp
-    ).run()
+        oldest_timestamp=oldest_timestamp,
+        shard=args.shard
+    )
+
+    if args.plan:
+        etl.plan()
+    else:
+        etl.run()
 
     # # Export and upload local_dir to a remote_folder in Google Drive.
     # SlackToGoogleDrive(
@@ -54,4 +85,12 @@ if __name__ == "__main__":
     #     oldest_timestamp=oldest_timestamp
     # ).run()
 
+    # # Export and upload local_dir under the slack/ prefix of an S3 bucket.
+    # SlackToS3(
+    #     local_dir=local_dir,
+    #     remote_dir="slack",
+    #     credentials=s3_credentials,
+    #     oldest_timestamp=oldest_timestamp
+    # ).run()
+
     logger.info("=== Slack backup completed ===")
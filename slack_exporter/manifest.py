@@ -0,0 +1,245 @@
+import argparse
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from slack_exporter.logger_config import logger
+
+
+MANIFEST_PREFIX = "slack_exporter."
+
+
+def is_metadata_file(path: Path) -> bool:
+    """Checks whether a file is written by slack_exporter itself rather than exported from Slack.
+
+    Slack channel names cannot contain dots, so metadata files never collide with channel files.
+    """
+    return path.name == "channels.json" or path.name.startswith(MANIFEST_PREFIX)
+
+
+class HashingWriter:
+    """Wraps a binary file to compute its size, SHA-256 and MD5 while it is being written.
+
+    MD5 is only kept because it is the checksum exposed by Google Drive.
+    Without a file, the data is only hashed.
+    """
+
+    def __init__(self, file=None):
+        self.file = file
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._md5 = hashlib.md5()
+
+    def write(self, data: bytes) -> int:
+        self._sha256.update(data)
+        self._md5.update(data)
+        self.size += len(data)
+        return self.file.write(data) if self.file else len(data)
+
+    def flush(self) -> None:
+        if self.file:
+            self.file.flush()
+
+    @property
+    def checksum(self) -> dict:
+        return {"size": self.size, "sha256": self._sha256.hexdigest(), "md5": self._md5.hexdigest()}
+
+
+def file_checksum(file_path: Path, chunk_size: int = 1024 * 1024) -> dict:
+    """Reads a file to compute the same checksum as a `HashingWriter`."""
+    writer = HashingWriter()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            writer.write(chunk)
+
+    return writer.checksum
+
+
+class Manifest:
+    """Describes the content of an export: which channels and files it holds, and for sharded exports, which shard it is.
+
+    Files are recorded by their path relative to the export folder, with the size and checksums computed while they were written.
+
+    Attributes:
+        shard (tuple[int, int]): The 1-based shard index and number of shards, or None for a full export.
+        created_at (str): The ISO 8601 creation date of the export.
+        channels (dict[str, dict]): The exported channels by ID, with their name, message count and file.
+        files (dict[str, dict]): The exported files by relative path, with their size, SHA-256 and MD5.
+    """
+
+    def __init__(
+            self,
+            shard: tuple[int, int] = None,
+            created_at: str = None,
+            channels: dict[str, dict] = None,
+            files: dict[str, dict] = None
+        ):
+        self.shard = tuple(shard) if shard else None
+        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
+        self.channels = channels or {}
+        self.files = files or {}
+
+    @property
+    def file_name(self) -> str:
+        if self.shard:
+            return f"{MANIFEST_PREFIX}manifest.shard-{self.shard[0]}-of-{self.shard[1]}.json"
+        return f"{MANIFEST_PREFIX}manifest.json"
+
+    def add_channel(self, channel_id: str, name: str, messages: int, path: str) -> None:
+        self.channels[channel_id] = {"name": name, "messages": messages, "path": path}
+
+    def add_file(self, path: str, checksum: dict) -> None:
+        self.files[path] = checksum
+
+    def move_file(self, old_path: str, new_path: str, checksum: dict = None) -> None:
+        """Records that a file was moved, or replaced by a transformed file when a new checksum is given."""
+        entry = self.files.pop(old_path, None)
+        if checksum or entry:
+            self.files[new_path] = checksum or entry
+
+    def to_dict(self) -> dict:
+        return {
+            "version": 1,
+            "created_at": self.created_at,
+            "shard": list(self.shard) if self.shard else None,
+            "channels": self.channels,
+            "files": self.files,
+        }
+
+    def save(self, folder: Path) -> Path:
+        """Writes the manifest into the export folder and returns its path."""
+        manifest_path = Path(folder) / self.file_name
+        with open(manifest_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+        return manifest_path
+
+    @classmethod
+    def load(cls, manifest_path: Path) -> "Manifest":
+        with open(manifest_path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Manifest":
+        return cls(
+            shard=data.get("shard"),
+            created_at=data.get("created_at"),
+            channels=data.get("channels"),
+            files=data.get("files")
+        )
+
+    @classmethod
+    def find(cls, folder: Path) -> "Manifest | None":
+        """Loads the manifest of an export folder, if it has one."""
+        for manifest_path in sorted(Path(folder).glob(f"{MANIFEST_PREFIX}manifest*.json")):
+            return cls.load(manifest_path)
+
+        return None
+
+    def verify(self, files: dict[str, dict], compare: tuple[str, ...] = ("size",)) -> list[str]:
+        """Compares the recorded files with the metadata of stored files.
+
+        Args:
+            files: The stored files by relative path, with any of their size, SHA-256 and MD5.
+            compare: The fields to compare, when known for the stored file.
+
+        Returns:
+            list[str]: A description of every missing or mismatching file. Empty if the backup is intact.
+        """
+        problems = []
+        for path, expected in sorted(self.files.items()):
+            actual = files.get(path)
+            if actual is None:
+                problems.append(f"Missing file: {path}")
+                continue
+
+            for field in compare:
+                if actual.get(field) is not None and str(actual[field]) != str(expected.get(field)):
+                    problems.append(f"{field} mismatch for {path}: expected {expected.get(field)}, got {actual[field]}")
+
+        return problems
+
+    def verify_local(self, folder: Path, deep: bool = False) -> list[str]:
+        """Checks the files of a local export against the manifest.
+
+        Args:
+            folder: The export folder.
+            deep: Whether to read the files to compare their SHA-256 instead of only their size.
+
+        Returns:
+            list[str]: A description of every missing or mismatching file. Empty if the backup is intact.
+        """
+        folder = Path(folder)
+        files = {}
+        for path in self.files:
+            file_path = folder / path
+            if file_path.is_file():
+                files[path] = file_checksum(file_path) if deep else {"size": file_path.stat().st_size}
+
+        return self.verify(files, compare=("size", "sha256"))
+
+
+def merge_manifests(manifests: list[Manifest]) -> Manifest:
+    """Combines the manifests of all shards of an export into a single catalog.
+
+    Raises:
+        ValueError: If shards are missing or duplicated, or if two shards exported the same channel.
+
+    Returns:
+        Manifest: A manifest covering all channels and files of the export.
+    """
+    if not manifests:
+        raise ValueError("No manifests to merge")
+
+    counts = {manifest.shard[1] if manifest.shard else 1 for manifest in manifests}
+    if len(counts) != 1:
+        raise ValueError(f"Manifests come from exports with different shard counts: {sorted(counts)}")
+
+    count = counts.pop()
+    indexes = sorted(manifest.shard[0] if manifest.shard else 1 for manifest in manifests)
+    if indexes != list(range(1, count + 1)):
+        raise ValueError(f"Expected exactly one manifest per shard 1..{count}, got shards {indexes}")
+
+    catalog = Manifest(created_at=min(manifest.created_at for manifest in manifests))
+    for manifest in manifests:
+        for channel_id, channel in manifest.channels.items():
+            if channel_id in catalog.channels:
+                raise ValueError(f"Channel {channel_id} was exported by several shards")
+            catalog.channels[channel_id] = channel
+
+        catalog.files.update(manifest.files)
+
+    return catalog
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge or verify export manifests.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    merge_parser = subparsers.add_parser("merge", help="Merge the manifests of a sharded export into a single catalog.")
+    merge_parser.add_argument("manifests", type=Path, nargs="+", help="The per-shard manifest files.")
+    merge_parser.add_argument("--output", type=Path, default=Path("."), help="The folder where the catalog is written.")
+
+    verify_parser = subparsers.add_parser("verify", help="Check a local export against its manifest.")
+    verify_parser.add_argument("folder", type=Path, help="The export folder.")
+    verify_parser.add_argument("--deep", action="store_true", help="Compare SHA-256 checksums instead of sizes only.")
+
+    args = parser.parse_args()
+
+    if args.command == "merge":
+        catalog_path = merge_manifests([Manifest.load(path) for path in args.manifests]).save(args.output)
+        logger.info(f"Catalog written to {catalog_path}")
+
+    else:
+        manifest = Manifest.find(args.folder)
+        if not manifest:
+            raise SystemExit(f"No manifest found in {args.folder}")
+
+        problems = manifest.verify_local(args.folder, deep=args.deep)
+        for problem in problems:
+            logger.error(problem)
+        if problems:
+            raise SystemExit(f"{len(problems)} problems found in {args.folder}")
+
+        logger.info(f"All {len(manifest.files)} files of {args.folder} match the manifest.")
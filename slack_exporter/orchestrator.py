@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from multiprocessing import Manager
+from pathlib import Path
+
+from slack_exporter.etl import ETL, SlackToGoogleDrive, SlackToLocal, SlackToMega, SlackToS3
+from slack_exporter.logger_config import logger
+
+
+DESTINATIONS: dict[str, type[ETL]] = {
+    "local": SlackToLocal,
+    "mega": SlackToMega,
+    "google_drive": SlackToGoogleDrive,
+    "s3": SlackToS3,
+}
+
+
+def load_config(config_path: Path) -> dict:
+    """Loads and validates a multi-workspace configuration file.
+
+    The file is a JSON document such as:
+
+        {
+            "max_workers": 4,
+            "max_concurrent_transfers": 8,
+            "workspaces": [
+                {
+                    "name": "acme",
+                    "token_env": "ACME_SLACK_BOT_TOKEN",
+                    "destination": "google_drive",
+                    "local_dir": "./backups/acme",
+                    "remote_dir": "GOOGLE_DRIVE_FOLDER_ID",
+                    "credentials": "./credentials.json",
+                    "oldest_days": 90
+                }
+            ]
+        }
+
+    Credentials of type dict may reference environment variables with a `$` prefix, e.g. `"password": "$MEGA_PASSWORD"`.
+
+    Raises:
+        ValueError: If a workspace has no name, no token or an unknown destination.
+
+    Returns:
+        dict: The parsed configuration.
+    """
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+
+    for workspace in config.get("workspaces", []):
+        if not workspace.get("name"):
+            raise ValueError("Every workspace needs a name")
+        if not workspace.get("token") and not workspace.get("token_env"):
+            raise ValueError(f"Workspace {workspace['name']} has no token or token_env")
+        if workspace.get("destination", "local") not in DESTINATIONS:
+            raise ValueError(
+                f"Workspace {workspace['name']} has an unknown destination: {workspace['destination']}. "
+                f"Expected one of {', '.join(DESTINATIONS)}"
+            )
+
+    return config
+
+
+def resolve_env(value):
+    """Replaces `$VARIABLE` strings by the value of the environment variable."""
+    if isinstance(value, dict):
+        return {key: resolve_env(item) for key, item in value.items()}
+    if isinstance(value, str) and value.startswith("$"):
+        return os.getenv(value[1:])
+    return value
+
+
+def build_etl(workspace: dict, transfer_slots=None) -> ETL:
+    """Creates the ETL of a single workspace from its configuration.
+
+    Args:
+        workspace: The workspace configuration.
+        transfer_slots: A semaphore shared by all workers to cap concurrent downloads and uploads.
+
+    Raises:
+        ValueError: If the token of the workspace is empty, e.g. because its token_env variable is not set.
+
+    Returns:
+        ETL: The ETL of the workspace's destination.
+    """
+    name = workspace["name"]
+
+    # An empty token would make the exporter fall back to SLACK_BOT_TOKEN, the token of another workspace
+    token = workspace.get("token") or os.getenv(workspace.get("token_env") or "")
+    if not token:
+        raise ValueError(f"Workspace {name} has an empty token, check its token or token_env variable")
+
+    oldest_timestamp = None
+    if workspace.get("oldest_days"):
+        oldest_timestamp = (datetime.now() - timedelta(days=workspace["oldest_days"])).timestamp()
+
+    etl_class = DESTINATIONS[workspace.get("destination", "local")]
+    return etl_class(
+        local_dir=workspace.get("local_dir", f"./slack_backup_{name}"),
+        remote_dir=workspace.get("remote_dir"),
+        credentials=resolve_env(workspace.get("credentials")),
+        file_suffix=workspace.get("file_suffix"),
+        oldest_timestamp=oldest_timestamp,
+        index_path=workspace.get("index_path"),
+        full_text_search=workspace.get("full_text_search", False),
+        layout=workspace.get("layout"),
+        history_windows=workspace.get("history_windows", 1),
+        call_interval=workspace.get("call_interval", 1.0),
+        chain_path=workspace.get("chain_path"),
+        full_every_days=workspace.get("full_every_days", 7),
+        normalized=workspace.get("normalized", False),
+        attachment_source=workspace.get("attachment_source", "messages"),
+        file_types=workspace.get("file_types"),
+        max_file_size=workspace.get("max_file_size"),
+        file_order=workspace.get("file_order"),
+        slack_token=token,
+        transfer_slots=transfer_slots
+    )
+
+
+def run_workspace(workspace: dict, transfer_slots=None) -> str:
+    """Runs the ETL of a single workspace. Executed in a worker process.
+
+    Args:
+        workspace: The workspace configuration.
+        transfer_slots: A semaphore shared by all workers to cap concurrent downloads and uploads.
+
+    Returns:
+        str: The name of the workspace.
+    """
+    name = workspace["name"]
+    logger.info(f"=== Starting backup of workspace {name} ===")
+
+    build_etl(workspace, transfer_slots).run()
+
+    logger.info(f"=== Backup of workspace {name} completed ===")
+    return name
+
+
+def run_all(config: dict) -> dict[str, bool]:
+    """Runs the ETLs of all configured workspaces in parallel, one process per workspace.
+
+    Each process owns its Slack exporter, so every token gets its own rate limiter.
+    Downloads and uploads of all processes share a global cap of `max_concurrent_transfers`.
+
+    Args:
+        config: The configuration returned by `load_config`.
+
+    Returns:
+        dict[str, bool]: Whether the backup of each workspace succeeded.
+    """
+    workspaces = config.get("workspaces", [])
+    max_workers = config.get("max_workers", os.cpu_count())
+    results = {}
+
+    with Manager() as manager:
+        transfer_slots = manager.BoundedSemaphore(config.get("max_concurrent_transfers", 4))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(run_workspace, workspace, transfer_slots): workspace["name"]
+                for workspace in workspaces
+            }
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                    results[name] = True
+                except Exception as e:
+                    logger.error(f"Backup of workspace {name} failed: {e}")
+                    results[name] = False
+
+    return results
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv, find_dotenv
+
+    load_dotenv(dotenv_path=find_dotenv())
+
+    parser = argparse.ArgumentParser(description="Back up several Slack workspaces in parallel.")
+    parser.add_argument("config", type=Path, help="Path to the JSON workspaces configuration.")
+    args = parser.parse_args()
+
+    results = run_all(load_config(args.config))
+
+    failed = [name for name, succeeded in results.items() if not succeeded]
+    if failed:
+        raise SystemExit(f"Backup failed for workspaces: {', '.join(failed)}")
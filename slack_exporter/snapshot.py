@@ -0,0 +1,154 @@
+import argparse
+import json
+import shutil
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from slack_exporter.logger_config import logger
+from slack_exporter.manifest import MANIFEST_PREFIX, is_metadata_file
+from slack_exporter.transform.layout import get_layout
+
+
+CHAIN_FILE_NAME = f"{MANIFEST_PREFIX}chain.json"
+
+
+class SnapshotChain:
+    """Chain manifest of a backup made of periodic full snapshots and small incremental deltas.
+
+    A full snapshot exports the whole backup window. Each following delta only exports the messages posted since the
+    previous snapshot started, and the attachments of these messages. A new full snapshot starts the next chain
+    once the last one is older than `full_every_days`. Messages edited or deleted after being backed up are not
+    captured by deltas, only by the next full snapshot.
+
+    Attributes:
+        chain_path (Path): The path to the chain manifest.
+        full_every_days (float): The maximum age of a full snapshot before a new one is taken.
+        snapshots (list[dict]): The snapshots of the chain, oldest first.
+    """
+
+    def __init__(self, chain_path: str | Path, full_every_days: float = 7):
+        self.chain_path = Path(chain_path)
+        self.full_every_days = full_every_days
+        self.snapshots = []
+
+        if self.chain_path.exists():
+            with open(self.chain_path, 'r') as f:
+                self.snapshots = json.load(f).get("snapshots", [])
+
+    def save(self, path: Path = None) -> Path:
+        """Writes the chain manifest, by default at its own path, and returns where it was written."""
+        path = Path(path or self.chain_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({"version": 1, "snapshots": self.snapshots}, f, indent=4)
+
+        return path
+
+    def next_snapshot(self, oldest_timestamp: float = None, layout: str = None, now: float = None) -> dict:
+        """Decides whether the next snapshot is a full base or a delta, and which time range it exports.
+
+        Args:
+            oldest_timestamp: The start of the backup window, exported by full snapshots.
+            layout: The name of the layout the snapshot is written with.
+            now: The time the snapshot starts. Defaults to the current time.
+
+        Returns:
+            dict: The snapshot, to be recorded once it has been uploaded.
+        """
+        now = now or time.time()
+        last_full = next((snapshot for snapshot in reversed(self.snapshots) if snapshot["kind"] == "full"), None)
+
+        if last_full and now - last_full["latest"] < self.full_every_days * 86400:
+            kind, base, oldest = "delta", last_full["id"], self.snapshots[-1]["latest"]
+        else:
+            kind, base, oldest = "full", None, oldest_timestamp
+
+        snapshot_id = f"{kind}-{datetime.fromtimestamp(now, tz=timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+        return {"id": snapshot_id, "kind": kind, "base": base, "oldest": oldest, "latest": now, "layout": layout}
+
+    def record(self, snapshot: dict) -> None:
+        self.snapshots.append(snapshot)
+
+    def snapshots_at(self, at: float = None) -> list[dict]:
+        """Returns the full snapshot and the deltas needed to rebuild the backup as it was at a given time.
+
+        Raises:
+            ValueError: If no full snapshot was taken before that time.
+        """
+        at = at or time.time()
+        available = [snapshot for snapshot in self.snapshots if snapshot["latest"] <= at]
+
+        base = next((snapshot for snapshot in reversed(available) if snapshot["kind"] == "full"), None)
+        if not base:
+            raise ValueError(f"No full snapshot found before {datetime.fromtimestamp(at, tz=timezone.utc).isoformat()}")
+
+        return [base] + [snapshot for snapshot in available if snapshot.get("base") == base["id"]]
+
+    def restore(self, snapshots_dir: Path, target_dir: Path, at: float = None) -> Path:
+        """Rebuilds the backup as it was at a given time by replaying a full snapshot and its deltas.
+
+        Messages are merged by channel and `ts`, later snapshots taking precedence, and attachments are copied
+        at the path they have in their snapshot.
+
+        Args:
+            snapshots_dir: The folder holding the snapshot folders, named after their ID.
+            target_dir: The folder where the backup is rebuilt.
+            at: The point in time to restore. Defaults to the latest snapshot.
+
+        Raises:
+            FileNotFoundError: If a snapshot of the chain is missing from the snapshots folder.
+
+        Returns:
+            Path: The restored folder.
+        """
+        snapshots_dir, target_dir = Path(snapshots_dir), Path(target_dir)
+        snapshots = self.snapshots_at(at)
+
+        channels = defaultdict(dict)
+        layout = get_layout(snapshots[0].get("layout"))
+
+        for snapshot in snapshots:
+            snapshot_dir = snapshots_dir / snapshot["id"]
+            if not snapshot_dir.is_dir():
+                raise FileNotFoundError(f"Snapshot {snapshot['id']} not found in {snapshots_dir}")
+
+            logger.info(f"Replaying {snapshot['kind']} snapshot {snapshot['id']}...")
+            snapshot_layout = get_layout(snapshot.get("layout"))
+
+            message_files = set()
+            for channel_name, path in snapshot_layout.iter_message_files(snapshot_dir):
+                message_files.add(path)
+                channels[channel_name].update(
+                    (message["ts"], message) for message in snapshot_layout.read_messages(path)
+                )
+
+            for path in snapshot_dir.rglob("*"):
+                if path.is_file() and path not in message_files and not is_metadata_file(path):
+                    destination = target_dir / path.relative_to(snapshot_dir)
+                    destination.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(path, destination)
+
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for channel_name, messages in channels.items():
+            ordered = sorted(messages.values(), key=lambda message: float(message["ts"]), reverse=True)
+            layout.write_channel(export_path=target_dir, channel_name=channel_name, messages=ordered)
+
+        logger.info(f"Restored {len(snapshots)} snapshots into {target_dir}")
+        return target_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild a backup at a point in time from its snapshot chain.")
+    parser.add_argument("chain", type=Path, help="The chain manifest.")
+    parser.add_argument("snapshots_dir", type=Path, help="The folder holding the downloaded snapshot folders.")
+    parser.add_argument("target_dir", type=Path, help="The folder where the backup is rebuilt.")
+    parser.add_argument("--at", type=datetime.fromisoformat, default=None, help="The ISO 8601 date to restore.")
+    args = parser.parse_args()
+
+    SnapshotChain(args.chain).restore(
+        snapshots_dir=args.snapshots_dir,
+        target_dir=args.target_dir,
+        at=args.at.timestamp() if args.at else None
+    )
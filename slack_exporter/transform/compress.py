@@ -2,13 +2,20 @@ import gzip
 from pathlib import Path
 
 from slack_exporter.logger_config import logger
+from slack_exporter.manifest import HashingWriter
 
 
 class FileCompressor:
-    """Class for compressing files that exceed a specified size limit."""
+    """Class for compressing files that exceed a specified size limit.
+
+    Attributes:
+        max_size (int): Files larger than this size, in bytes, are compressed.
+        checksums (dict[Path, dict]): The size and checksums of the compressed files, computed while they were written.
+    """
     
     def __init__(self, max_size: int = 0):
         self.max_size = max_size
+        self.checksums = {}
 
     def check_file_size(self, file_path: Path) -> bool:
         """Checks if the file size exceeds the maximum size.
@@ -41,9 +48,11 @@ class FileCompressor:
             
             compressed_file_path = file_path.with_suffix(file_path.suffix + ".gz")
             try:
-                with open(file_path, 'rb') as f_in:
-                    with gzip.open(compressed_file_path, 'wb') as f_out:
+                with open(file_path, 'rb') as f_in, open(compressed_file_path, 'wb') as f_raw:
+                    writer = HashingWriter(f_raw)
+                    with gzip.GzipFile(filename=file_path.name, mode='wb', fileobj=writer) as f_out:
                         f_out.writelines(f_in)
+                self.checksums[compressed_file_path] = writer.checksum
                 logger.info(f"Compressed {file_path} to {compressed_file_path}")
 
                 if replace:
@@ -0,0 +1,203 @@
+import gzip
+import json
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+
+from slack_exporter.manifest import HashingWriter, Manifest, is_metadata_file
+from slack_exporter.transform.normalize import expand_messages, is_normalized, normalize_messages
+
+
+class Layout(ABC):
+    """Abstract base class for output layouts, which decide where the exporter writes messages and attachments.
+
+    Files are written directly at their final location, so that no reorganization pass is needed after the export.
+    Message files are written as indented JSON, or in the compact normalized format, see `normalize_messages`.
+    Both are read transparently.
+
+    Attributes:
+        name (str): The name of the layout, as accepted by `get_layout`.
+        normalized (bool): Whether message files are written in the compact normalized format.
+    """
+
+    name: str = None
+
+    def __init__(self, normalized: bool = False):
+        self.normalized = normalized
+
+    @abstractmethod
+    def write_channel(
+            self,
+            export_path: Path,
+            channel_name: str,
+            messages: list[dict],
+            manifest: Manifest = None
+        ) -> list[Path]:
+        """Writes the messages of a channel.
+
+        Args:
+            export_path: The root folder of the export.
+            channel_name: The name of the channel.
+            messages: The messages of the channel, as returned by conversations.history.
+            manifest: Optional manifest where the checksums of the written files are recorded.
+
+        Returns:
+            list[Path]: The written files.
+        """
+        ...
+
+    @abstractmethod
+    def iter_message_files(self, export_path: Path) -> Iterator[tuple[str, Path]]:
+        """Yields the channel name and path of every message file of an export."""
+        ...
+
+    @abstractmethod
+    def attachment_path(self, export_path: Path, channel_name: str, file_name: str) -> Path:
+        """Returns the path where an attachment of a channel is saved."""
+        ...
+
+    @staticmethod
+    def read_messages(path: Path) -> list[dict]:
+        """Reads the messages of a message file, whether it holds a conversations.history payload,
+        a list of messages or a normalized document."""
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, 'rt') as f:
+            data = json.load(f)
+
+        if is_normalized(data):
+            return expand_messages(data)
+
+        return data.get("messages", []) if isinstance(data, dict) else data
+
+    def _write_messages(
+            self,
+            path: Path,
+            messages: list[dict],
+            export_path: Path,
+            manifest: Manifest = None,
+            envelope: bool = False
+        ) -> Path:
+        """Writes a message file, recording its checksums in the manifest as it is written.
+
+        Args:
+            envelope: Whether indented files wrap the messages in a conversations.history payload rather than a list.
+        """
+        if self.normalized:
+            content = json.dumps(normalize_messages(messages), separators=(",", ":"))
+        elif envelope:
+            content = json.dumps({"ok": True, "messages": messages, "has_more": False}, indent=4)
+        else:
+            content = json.dumps(messages, indent=4)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            writer = HashingWriter(f)
+            writer.write(content.encode())
+
+        if manifest:
+            manifest.add_file(path.relative_to(export_path).as_posix(), writer.checksum)
+
+        return path
+
+
+class ExtensionLayout(Layout):
+    """Writes one file per channel at the root of the export, and sorts attachments by extension.
+
+        export_path/
+            general.json
+            general/
+                pdf/report.pdf
+                png/screenshot.png
+    """
+
+    name = "by_extension"
+
+    def write_channel(
+            self,
+            export_path: Path,
+            channel_name: str,
+            messages: list[dict],
+            manifest: Manifest = None
+        ) -> list[Path]:
+        return [self._write_messages(export_path / f"{channel_name}.json", messages, export_path, manifest, envelope=True)]
+
+    def iter_message_files(self, export_path: Path) -> Iterator[tuple[str, Path]]:
+        for path in sorted([*export_path.glob("*.json"), *export_path.glob("*.json.gz")]):
+            if not is_metadata_file(path):
+                yield path.name.split(".")[0], path
+
+    def attachment_path(self, export_path: Path, channel_name: str, file_name: str) -> Path:
+        return export_path / channel_name / Path(file_name).suffix[1:] / file_name
+
+
+class SlackExportLayout(Layout):
+    """Writes messages like Slack's official exports, with one file per channel and per day, and attachments next to them.
+
+        export_path/
+            general/
+                2025-01-01.json
+                2025-01-02.json
+                files/report.pdf
+
+    Days are computed in UTC. Writing a channel only touches the days it has messages for: messages are merged
+    into existing day files by `ts`, so incremental runs append to or replace single days.
+    """
+
+    name = "slack"
+
+    def write_channel(
+            self,
+            export_path: Path,
+            channel_name: str,
+            messages: list[dict],
+            manifest: Manifest = None
+        ) -> list[Path]:
+        days = defaultdict(list)
+        for message in messages:
+            day = datetime.fromtimestamp(float(message["ts"]), tz=timezone.utc).strftime("%Y-%m-%d")
+            days[day].append(message)
+
+        written = []
+        for day, day_messages in sorted(days.items()):
+            path = export_path / channel_name / f"{day}.json"
+
+            merged = {message["ts"]: message for message in self.read_messages(path)} if path.exists() else {}
+            merged.update((message["ts"], message) for message in day_messages)
+
+            ordered = sorted(merged.values(), key=lambda message: float(message["ts"]))
+            written.append(self._write_messages(path, ordered, export_path, manifest))
+
+        return written
+
+    def iter_message_files(self, export_path: Path) -> Iterator[tuple[str, Path]]:
+        for channel_folder in sorted(path for path in export_path.iterdir() if path.is_dir()):
+            for path in sorted([*channel_folder.glob("*.json"), *channel_folder.glob("*.json.gz")]):
+                yield channel_folder.name, path
+
+    def attachment_path(self, export_path: Path, channel_name: str, file_name: str) -> Path:
+        return export_path / channel_name / "files" / file_name
+
+
+LAYOUTS: dict[str, type[Layout]] = {layout.name: layout for layout in (ExtensionLayout, SlackExportLayout)}
+
+
+def get_layout(layout: str | Layout | None, normalized: bool = False) -> Layout:
+    """Returns a layout instance from its name, defaulting to the by-extension layout.
+
+    Args:
+        layout: A layout name or instance. Instances are returned as is.
+        normalized: Whether the layout writes message files in the compact normalized format.
+
+    Raises:
+        ValueError: If the layout name is unknown.
+    """
+    if isinstance(layout, Layout):
+        return layout
+    if layout is None:
+        return ExtensionLayout(normalized=normalized)
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}. Expected one of {', '.join(LAYOUTS)}")
+
+    return LAYOUTS[layout](normalized=normalized)
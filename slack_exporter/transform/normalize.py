@@ -0,0 +1,99 @@
+import json
+
+
+FORMAT = "slack_exporter.normalized/1"
+
+
+def _text_blocks(text: str, block_id: str) -> list[dict]:
+    """Returns the rich text blocks Slack generates for a plain text message."""
+    return [{
+        "type": "rich_text",
+        "block_id": block_id,
+        "elements": [{"type": "rich_text_section", "elements": [{"type": "text", "text": text}]}]
+    }]
+
+
+class _Table:
+    """Dictionary encoder that stores each distinct object once and refers to it by index."""
+
+    def __init__(self):
+        self.rows = []
+        self._indexes = {}
+
+    def add(self, row: dict) -> int:
+        key = json.dumps(row, sort_keys=True)
+        if key not in self._indexes:
+            self._indexes[key] = len(self.rows)
+            self.rows.append(row)
+
+        return self._indexes[key]
+
+
+def normalize_messages(messages: list[dict]) -> dict:
+    """Encodes messages in the compact normalized format.
+
+    User profiles and file metadata repeated across messages are moved to side tables and replaced by their index,
+    and `blocks` that merely repeat the plain `text` of a message are replaced by their block ID.
+    The encoding is lossless: `expand_messages` returns the original messages.
+
+    Args:
+        messages: The messages, as returned by conversations.history.
+
+    Returns:
+        dict: The normalized document.
+    """
+    profiles, files = _Table(), _Table()
+    normalized = []
+
+    for message in messages:
+        message = dict(message)
+
+        if "user_profile" in message:
+            message["_user_profile"] = profiles.add(message.pop("user_profile"))
+
+        if "files" in message:
+            message["_files"] = [files.add(file_info) for file_info in message.pop("files")]
+
+        blocks = message.get("blocks")
+        if blocks and len(blocks) == 1 and "text" in message:
+            block_id = blocks[0].get("block_id")
+            if blocks == _text_blocks(message["text"], block_id):
+                del message["blocks"]
+                message["_text_block_id"] = block_id
+
+        normalized.append(message)
+
+    return {"format": FORMAT, "user_profiles": profiles.rows, "files": files.rows, "messages": normalized}
+
+
+def expand_messages(document: dict) -> list[dict]:
+    """Decodes a document written by `normalize_messages` back into the original messages.
+
+    Raises:
+        ValueError: If the document is not in the normalized format.
+    """
+    if document.get("format") != FORMAT:
+        raise ValueError(f"Unsupported format: {document.get('format')}")
+
+    profiles, files = document.get("user_profiles", []), document.get("files", [])
+    messages = []
+
+    for message in document.get("messages", []):
+        message = dict(message)
+
+        if "_user_profile" in message:
+            message["user_profile"] = profiles[message.pop("_user_profile")]
+
+        if "_files" in message:
+            message["files"] = [files[index] for index in message.pop("_files")]
+
+        if "_text_block_id" in message:
+            message["blocks"] = _text_blocks(message["text"], message.pop("_text_block_id"))
+
+        messages.append(message)
+
+    return messages
+
+
+def is_normalized(data) -> bool:
+    return isinstance(data, dict) and data.get("format") == FORMAT
@@ -36,3 +36,22 @@ def get_files_in_folder(folder_path: Path, file_list: list[Path] = None) -> list
             file_list.append(Path(root) / file)
         
     return file_list
+
+def add_suffix_to_filename(file_name: str, file_suffix: str = None) -> str:
+    """Inserts a suffix before the file extension, e.g. `report.pdf` -> `report_20250101.pdf`.
+
+    Args:
+        file_name: The original file name.
+        file_suffix: The suffix to insert. The name is returned unchanged if empty.
+
+    Returns:
+        The file name with the suffix inserted.
+    """
+    if not file_suffix:
+        return file_name
+
+    if "." in file_name:
+        basename, extension = file_name.rsplit(".", 1)
+        return basename + file_suffix + "." + extension
+
+    return file_name + file_suffix